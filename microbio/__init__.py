@@ -0,0 +1 @@
+"""Shared helpers for the air microbiology analyses (culture, qPCR/dPCR, 16S isolates)."""
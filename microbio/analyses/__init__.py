@@ -0,0 +1,25 @@
+# === Analyses behind the `microbio` subcommands ===
+# name -> (module, one-line help). Modules are imported only when their subcommand
+# runs, so `microbio --help` does not pay for pandas, scipy or plotly.
+ANALYSES = {
+    'wpn-check': ('microbio.analyses.wpn_check',
+                  "WPN control vs other locations: sedimentation counts, CV and box plot"),
+    'wpn-pcr': ('microbio.analyses.wpn_pcr',
+                "WPN control vs other locations for sedimentation, qPCR, sec and regA"),
+    'location-averages': ('microbio.analyses.location_averages',
+                          "average sedimentation/scrubber/qPCR/dPCR amounts per localization"),
+    'method-averages': ('microbio.analyses.method_averages',
+                        "coliform and Pseudomonas isolates and diversity per location and method"),
+    'medium-distribution': ('microbio.analyses.medium_distribution',
+                            "genus distribution per culture medium (donut charts)"),
+    'sunburst': ('microbio.analyses.sunburst',
+                 "localization → medium → genus sunburst per sampling cycle"),
+    'diversity': ('microbio.analyses.diversity',
+                  "Shannon, Simpson, Chao1 and rarefaction per location/method and cycle/location/medium"),
+}
+
+
+def load_analysis(name):
+    import importlib
+
+    return importlib.import_module(ANALYSES[name][0])
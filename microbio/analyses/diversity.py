@@ -0,0 +1,64 @@
+import pandas as pd
+
+from microbio import datasets, figures
+from microbio.analyses.method_averages import detect_methods
+from microbio.diversity import alpha_diversity
+from microbio.locations import load_location_registry
+from microbio.store import open_store
+from microbio.taxonomy import genus_column
+from microbio.tracing import span, traced
+from microbio.workbooks import load_inputs
+
+INPUTS = {
+    'gram_negative': (datasets.CULTURE_WORKBOOK, datasets.GRAM_NEGATIVE_SHEET),
+    'isolates': (datasets.ISOLATE_WORKBOOK, datasets.ISOLATE_SHEET),
+}
+
+# Cells of the two isolate tables: the G(-) sheet records the sampling method, the 16S
+# table the cycle and medium
+METHOD_CELLS = ['Location', 'Method']
+CYCLE_CELLS = ['cycle', 'location', 'medium']
+
+
+@traced('diversity.by_method')
+def by_method(df):
+    """Diversity per location × sampling method from the G(-) sheet."""
+    cells = pd.DataFrame({
+        'Location': pd.Series(load_location_registry().resolve(df['Miejsce poboru']), index=df.index, dtype=object),
+        'Method': detect_methods(df['Metoda poboru']),
+        'genus': genus_column(df['Rodzaj/gatunek']),
+    }).dropna(subset=['Location'])
+    return alpha_diversity(cells, METHOD_CELLS, 'genus')
+
+
+@traced('diversity.by_cycle')
+def by_cycle(counts):
+    """Diversity per cycle × location × medium from the aggregate store's isolate counts."""
+    return alpha_diversity(counts, CYCLE_CELLS, 'genus', count_column='count')
+
+
+def report(title, table, depth):
+    rarefied = f"S_rarefied: expected genera in {depth} isolates" if depth else "no cell has enough isolates to rarefy"
+    print(f"{title} ({rarefied}):\n" + table.round(3).to_string(index=False) + "\n")
+
+
+def run(data_dir, renderer=None, frames=None):
+    frames = frames or load_inputs(INPUTS, data_dir)
+    methods, method_curves, depth = by_method(frames['gram_negative'])
+    report("Diversity by location and sampling method", methods, depth)
+
+    store = open_store(data_dir)
+    with span('diversity.refresh'):
+        store.update_isolates(frames['isolates'])
+        store.save()
+    cycles, cycle_curves, depth = by_cycle(store.cycle_counts())
+    report("Diversity by cycle, location and medium", cycles, depth)
+
+    if renderer is not None:
+        renderer.submit('rarefaction_method', figures.rarefaction_curves, method_curves,
+                        "Rarefaction of Gram-negative genera by location and sampling method")
+        for cycle in cycle_curves.index.unique('cycle'):
+            renderer.submit(f'rarefaction_cycle_{cycle}', figures.rarefaction_curves,
+                            cycle_curves.xs(cycle, level='cycle'),
+                            f"Rarefaction of genera by location and medium (Cycle {cycle})")
+    return methods, cycles
@@ -0,0 +1,105 @@
+import pandas as pd
+
+from microbio import datasets, figures
+from microbio.concordance import concordance, concordance_matrix
+from microbio.store import open_store
+from microbio.tracing import traced
+from microbio.workbooks import load_inputs
+
+INPUTS = {
+    'culture': (datasets.CULTURE_WORKBOOK, datasets.CULTURE_SHEET),
+    'pcr': (datasets.PCR_WORKBOOK, datasets.PCR_SHEET),
+}
+
+METHODS = ['sedymentacja', 'pluczka', 'qPCR', 'DNA_sec', 'DNA_regA']
+STORE_METHODS = {'sedimentation': 'sedymentacja', 'sec': 'DNA_sec', 'regA': 'DNA_regA'}
+
+# === LABELS ===
+METHOD_LABELS = {
+#    "sedymentacja_scaled": "Sedimentation",
+#    "pluczka_scaled": "Scrubber",
+#    "qPCR_scaled": "qPCR 16S",
+#    "DNA_sec_scaled": "dPCR (sec)",
+    "DNA_regA_scaled": "dPCR (regA)"
+}
+CONCORDANCE_LABELS = {
+    'sedymentacja': "Sedimentation",
+    'pluczka': "Scrubber",
+    'qPCR': "qPCR 16S",
+    'DNA_sec': "dPCR (sec)",
+    'DNA_regA': "dPCR (regA)",
+}
+
+
+@traced('location-averages.prepare')
+def prepare(store):
+    # AVERAGE per localization, from the stored per-location sums/counts
+    merged = store.measurement_means().rename(columns=STORE_METHODS)
+    merged = merged.reindex(columns=METHODS).rename_axis(columns=None).reset_index(names='lokalizacja')
+
+    # === SCALE TO ×10² ===
+    for col in METHODS:
+        merged[f"{col}_scaled"] = merged[col] / 100
+    return merged
+
+
+@traced('location-averages.melt')
+def melt(merged):
+    # === MELT FOR PLOTTING ===
+    df_melted = merged.melt(
+        id_vars='lokalizacja',
+        value_vars=[f"{col}_scaled" for col in METHODS],
+        var_name='Method',
+        value_name='Wartosc_scaled'
+    )
+    df_melted["Method"] = df_melted["Method"].map(METHOD_LABELS)
+
+    df_melted["label"] = df_melted["Wartosc_scaled"].map(
+        lambda x: f"{x:.2f} × 10²" if pd.notna(x) else ""
+    )
+
+    # === OPTIONAL: SORT LOCATIONS BY TOTAL VALUES ===
+    sum_all = merged[[f"{col}_scaled" for col in METHODS]].sum(axis=1)
+    lokalizacja_order = merged.assign(sum_all=sum_all).sort_values('sum_all')['lokalizacja'].tolist()
+    df_melted["lokalizacja"] = pd.Categorical(df_melted["lokalizacja"], categories=lokalizacja_order, ordered=True)
+    return df_melted
+
+
+@traced('location-averages.concordance')
+def method_concordance(merged, seed=0):
+    """Agreement of every method pair over the per-location means (log10 scale)."""
+    table = concordance(merged[METHODS].rename(columns=CONCORDANCE_LABELS), seed=seed)
+    cells = table.assign(cell=[f"{e:.2f} [{lo:.2f}, {hi:.2f}]" for e, lo, hi
+                               in zip(table['estimate'], table['ci_low'], table['ci_high'])])
+    pairs = pd.MultiIndex.from_frame(table[['method_a', 'method_b', 'n']].drop_duplicates())
+    wide = cells.pivot(index=['method_a', 'method_b', 'n'], columns='statistic', values='cell')
+    wide = wide.reindex(index=pairs, columns=list(dict.fromkeys(table['statistic'])))
+    print("\nMethod concordance over locations (log10; estimate [95% bootstrap CI]):\n"
+          + wide.reset_index().to_string(index=False))
+    return table
+
+
+@traced('location-averages.refresh')
+def refresh(store, frames):
+    """Add new culture (parsed, e.g., 3,6×10^2 → 360) and qPCR/dPCR rows to the store."""
+    added = store.update_measurements('culture', datasets.culture_measurements(frames['culture']),
+                                      ['sedimentation', 'pluczka'])
+    added += store.update_measurements('pcr', datasets.pcr_measurements(frames['pcr']), ['qPCR', 'sec', 'regA'])
+    return added
+
+
+def run(data_dir, renderer=None, frames=None):
+    store = open_store(data_dir)
+    added = refresh(store, frames or load_inputs(INPUTS, data_dir))
+    store.save()
+    print(f"Aggregate store: {added} new measurement row(s)")
+
+    merged = prepare(store)
+    print(merged[["lokalizacja"] + METHODS].to_string(index=False))
+    agreement = method_concordance(merged)
+    if renderer is not None:
+        # === PLOT ===
+        renderer.submit("average_per_localization", figures.location_method_bars, melt(merged))
+        renderer.submit("method_concordance", figures.concordance_heatmap, concordance_matrix(agreement),
+                        "Lin's concordance (log10) between methods over locations")
+    return merged
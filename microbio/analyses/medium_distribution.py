@@ -0,0 +1,35 @@
+from microbio import datasets, figures
+from microbio.contingency import independence_tests
+from microbio.store import open_store
+from microbio.tracing import span, traced
+from microbio.workbooks import load_inputs
+
+INPUTS = {'isolates': (datasets.ISOLATE_WORKBOOK, datasets.ISOLATE_SHEET)}
+
+
+@traced('medium-distribution.plot')
+def plot(grouped, renderer):
+    # Generate donut chart for each medium
+    for medium, data in grouped.groupby('Podloze', sort=False):
+        renderer.submit(f"donut_{medium}", figures.medium_donut, data, medium)
+
+
+def run(data_dir, renderer=None, frames=None):
+    frames = frames or load_inputs(INPUTS, data_dir)
+    store = open_store(data_dir)
+    with span('medium-distribution.refresh'):
+        store.update_isolates(frames['isolates'])
+        store.save()
+
+    # Group by medium and genus (from the shared isolate cube)
+    with span('medium-distribution.medium_genus'):
+        grouped = store.cube().medium_genus()
+    print(grouped.to_string(index=False))
+
+    # Does the genus mix depend on the medium? One χ²/G-test per cycle
+    isolate_counts = store.cycle_counts()
+    tests = independence_tests(isolate_counts[isolate_counts['genus'] != ''], 'medium', 'genus')
+    print("\nMedium vs genus independence per cycle:\n" + tests.round(4).to_string(index=False))
+    if renderer is not None:
+        plot(grouped, renderer)
+    return grouped
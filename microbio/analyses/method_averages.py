@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from microbio import datasets, figures
+from microbio.genus_groups import group_cube
+from microbio.locations import load_location_registry
+from microbio.tracing import traced
+from microbio.workbooks import load_inputs
+
+INPUTS = {'isolates': (datasets.CULTURE_WORKBOOK, datasets.GRAM_NEGATIVE_SHEET)}
+
+# === Genus groups: name -> genera keywords ===
+GENUS_GROUPS = {
+    # Coliform-related genera
+    'coliform': ['Pantoea', 'Enterobacter', 'Klebsiella', 'Citrobacter', 'Erwinia',
+                 'Moellerella', 'Leclercia', 'Kluyvera', 'Buttiauxella'],
+    # Pseudomonas-related genera
+    'Pseudomonas': ['Pseudomonas'],
+}
+
+METHOD_LIST = ['Sedimentation', 'Rinse', 'Culture']
+
+
+# === Standardize sampling method ===
+def detect_method(text):
+    text = str(text).lower()
+    if 'hodowla' in text:
+        return 'Culture'
+    elif 'płuczka' in text:
+        return 'Rinse'
+    elif 'sedymentacja' in text:
+        return 'Sedimentation'
+    else:
+        return 'Other'
+
+
+def detect_methods(values):
+    """detect_method once per distinct 'Metoda poboru' value."""
+    codes, uniques = pd.factorize(pd.Series(values, copy=False))
+    methods = np.array([detect_method(u) for u in uniques] + [detect_method(np.nan)], dtype=object)
+    return methods[codes]
+
+
+@traced('method-averages.analyze')
+def analyze(df):
+    site = pd.Series(load_location_registry().resolve(df['Miejsce poboru']), index=df.index, dtype=object)
+    locations = sorted(site.dropna().unique())
+    df = df.assign(**{'Miejsce poboru': site, 'Method': detect_methods(df['Metoda poboru'])})
+    # === Summary for every genus group × location × method, zero-filled ===
+    summary = group_cube(df, GENUS_GROUPS, 'Rodzaj/gatunek', 'Miejsce poboru', 'Method', locations, METHOD_LIST)
+    for group, part in summary.groupby('Group', sort=False):
+        print(f"{group}:\n" + part.drop(columns='Group').to_string(index=False) + "\n")
+    return locations, summary
+
+
+@traced('method-averages.plot')
+def plot(locations, summary, renderer):
+    # === Draw count and diversity charts for every group ===
+    for group, part in summary.groupby('Group', sort=False):
+        slug = group.lower()
+        renderer.submit(f'{slug}_sample_count', figures.grouped_bar, part, 'Sample_count',
+                        f'Number of {group} bacteria samples by location and sampling method',
+                        'Number of isolates', locations, METHOD_LIST)
+
+        renderer.submit(f'{slug}_diversity', figures.grouped_bar, part, 'Diversity',
+                        f'Diversity of {group} bacteria by location and sampling method',
+                        'Unique genera/species', locations, METHOD_LIST)
+
+
+def run(data_dir, renderer=None, frames=None):
+    df = (frames or load_inputs(INPUTS, data_dir))['isolates']
+    locations, summary = analyze(df)
+    if renderer is not None:
+        plot(locations, summary, renderer)
+    return summary
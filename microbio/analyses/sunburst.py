@@ -0,0 +1,32 @@
+from microbio import datasets, figures
+from microbio.contingency import independence_tests
+from microbio.store import MISSING_CYCLE, open_store
+from microbio.tracing import span
+from microbio.workbooks import load_inputs
+
+INPUTS = {'isolates': (datasets.ISOLATE_WORKBOOK, datasets.ISOLATE_SHEET)}
+
+
+def run(data_dir, renderer=None, frames=None):
+    frames = frames or load_inputs(INPUTS, data_dir)
+    store = open_store(data_dir)
+    with span('sunburst.refresh'):
+        refreshed = store.update_isolates(frames['isolates'])
+        store.save()
+    print(f"Aggregate store: {len(refreshed)} cycle(s) recomputed" + (f" ({', '.join(refreshed)})" if refreshed else ""))
+
+    # Does the genus mix depend on the localization? One χ²/G-test per cycle
+    isolate_counts = store.cycle_counts()
+    tests = independence_tests(isolate_counts[isolate_counts['genus'] != ''], 'location', 'genus')
+    print("Localization vs genus independence per cycle:\n" + tests.round(4).to_string(index=False) + "\n")
+
+    cube = store.cube()
+    # Build enhanced sunburst per cycle with localization
+    with span('sunburst.plot'):
+        for cycle in cube.cycles:
+            if cycle == MISSING_CYCLE:
+                continue
+            counts = cube.cycle(cycle)
+            print(f"Cycle {cycle}: {counts['count'].sum()} isolates, {len(counts)} localization/medium/genus groups")
+            if renderer is not None:
+                renderer.submit(f"sunburst_cycle_{cycle}", figures.cycle_sunburst, counts, cycle)
@@ -0,0 +1,101 @@
+import numpy as np
+
+from microbio import datasets, figures
+from microbio.bootstrap import bootstrap_ci
+from microbio.stats import compare_groups
+from microbio.tracing import traced
+from microbio.workbooks import load_inputs
+
+INPUTS = {'culture': (datasets.CULTURE_WORKBOOK, datasets.CULTURE_SHEET)}
+
+CV_THRESHOLD = 15  # %
+
+
+@traced('wpn-check.prepare')
+def prepare(frames):
+    df_clean = datasets.culture_measurements(frames['culture'], scrubber=False)
+    # Create group column
+    df_clean["group"] = datasets.location_group(df_clean["lokalizacja"])
+    return df_clean
+
+
+@traced('wpn-check.analyze')
+def analyze(df_clean):
+    # --- DEBUG: Check unique locations and groups ---
+    print("Unique locations:", df_clean["lokalizacja"].unique())
+    print("Unique groups:", df_clean["group"].unique())
+
+    # === Split data into two groups ===
+    wpn_vals = df_clean[df_clean["group"] == datasets.CONTROL_GROUP]["sedimentation"].dropna()
+    other_vals = df_clean[df_clean["group"] == datasets.OTHER_GROUP]["sedimentation"].dropna()
+
+    # --- DEBUG: Check sample sizes and samples ---
+    print(f"Number of samples WPN: {len(wpn_vals)}")
+    print(f"Number of samples Other: {len(other_vals)}")
+    print("WPN samples:", wpn_vals.to_list())
+    print("Other samples:", other_vals.to_list())
+
+    print("\nANALYSIS: SEDIMENTATION\n" + "-"*40)
+
+    # === Shapiro-Wilk normality tests + group difference test ===
+    result = compare_groups(df_clean, ["sedimentation"], group_col="group").iloc[0]
+    p_wpn, p_other = result["shapiro_p_a"], result["shapiro_p_b"]
+    if not (np.isnan(p_wpn) or np.isnan(p_other)):
+        print(f"Shapiro-Wilk (WPN): p = {p_wpn:.4f} {'normal' if p_wpn > 0.05 else 'not normal'}")
+        print(f"Shapiro-Wilk (Other): p = {p_other:.4f} {'normal' if p_other > 0.05 else 'not normal'}")
+    else:
+        print("Not enough data for Shapiro normality test. Using nonparametric test.")
+
+    p_val = result["p_value"]
+    test_name = result["test"] if not np.isnan(p_val) else "Insufficient data for test"
+
+    print(f"\n📊 {test_name}: p = {p_val if not np.isnan(p_val) else 'NaN'}")
+    if not np.isnan(p_val) and p_val < 0.05:
+        print("WPN has significantly fewer bacteria")
+    else:
+        print("No significant difference or insufficient data")
+
+    # === Calculate CV for WPN ===
+    if len(wpn_vals) > 1:
+        mean = wpn_vals.mean()
+        std = wpn_vals.std()
+        cv = std / mean * 100 if mean != 0 else np.nan
+        print(f"\nMean (WPN): {mean:.2f}")
+        print(f"📉 Standard deviation: {std:.2f}")
+        print(f"📊 CV% (WPN): {cv:.2f}%")
+
+        # Bootstrap CIs: with small n the point estimate alone is too noisy to judge
+        ci = bootstrap_ci(wpn_vals, n_resamples=10_000, seed=0)
+        for stat, label in [("mean", "Mean"), ("sd", "SD"), ("cv", "CV%")]:
+            print(f"   95% bootstrap CI {label}: {ci.loc[stat, 'ci_low']:.2f} – {ci.loc[stat, 'ci_high']:.2f}")
+        if not np.isnan(cv):
+            if ci.loc["cv", "ci_high"] < CV_THRESHOLD:
+                print("Low variability – good control")
+            elif ci.loc["cv", "ci_low"] >= CV_THRESHOLD:
+                print("High variability – control may be unstable")
+            else:
+                print(f"Inconclusive – CV% interval spans the {CV_THRESHOLD}% threshold")
+    else:
+        print("\nNot enough data to calculate CV for WPN")
+
+    return test_name, p_val
+
+
+@traced('wpn-check.plot')
+def plot(df_clean, test_name, p_val, renderer):
+    # === Boxplot ===
+    renderer.submit(
+        "wpn_box_sedimentation",
+        figures.group_box,
+        df_clean[["group", "sedimentation"]], "sedimentation", "group",
+        title="Comparison of bacterial counts (sedimentation) per m³ – WPN vs Other locations",
+        labels={"sedimentation": "Bacteria / m³", "group": "Group"},
+        annotation=f"{test_name}, p = {p_val:.4f}" if not np.isnan(p_val) else "Insufficient data for test"
+    )
+
+
+def run(data_dir, renderer=None, frames=None):
+    df_clean = prepare(frames or load_inputs(INPUTS, data_dir))
+    test_name, p_val = analyze(df_clean)
+    if renderer is not None:
+        plot(df_clean, test_name, p_val, renderer)
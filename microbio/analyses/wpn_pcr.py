@@ -0,0 +1,74 @@
+import pandas as pd
+
+from microbio import datasets, figures
+from microbio.locations import load_location_registry
+from microbio.stats import compare_groups
+from microbio.tracing import traced
+from microbio.workbooks import load_inputs
+
+INPUTS = {
+    'culture': (datasets.CULTURE_WORKBOOK, datasets.CULTURE_SHEET),
+    'pcr': (datasets.PCR_WORKBOOK, datasets.PCR_SHEET),
+}
+
+VARIABLES = ["sedimentation", "qPCR", "sec", "regA"]
+
+
+@traced('wpn-pcr.prepare')
+def prepare(frames):
+    # === Load and clean culture data ===
+    df_culture = datasets.culture_measurements(frames['culture'], scrubber=False)
+
+    # === Load and clean qPCR/dPCR data ===
+    df_qpcr = datasets.pcr_measurements(frames['pcr'])
+
+    # === Merge dataframes on the integer location id ===
+    df = pd.merge(
+        df_culture[["location_id", "sedimentation"]],
+        df_qpcr[["location_id", "qPCR", "sec", "regA"]],
+        on="location_id",
+        how="outer"
+    )
+    registry = load_location_registry()
+    df.insert(0, "lokalizacja", registry.from_ids(df["location_id"]))
+    df.insert(1, "group", registry.group(df["lokalizacja"]))
+    return df
+
+
+@traced('wpn-pcr.analyze')
+def analyze(df):
+    # === Statistics: every variable in one batched pass ===
+    results = compare_groups(df, VARIABLES, group_col="group")
+    print(results[["variable", "n_a", "n_b", "test", "p_value", "p_holm", "p_bh"]].to_string(index=False))
+
+    for row in results.itertuples():
+        print(f"\n📊 Analyzing: {row.variable}")
+        if row.test == "Insufficient data":
+            print("Not enough data.")
+            continue
+        print(f"{row.test}: p = {row.p_value:.4f}")
+    return results
+
+
+@traced('wpn-pcr.plot')
+def plot(df, results, renderer):
+    for row in results.itertuples():
+        if row.test == "Insufficient data":
+            continue
+        # Plot boxplot with all data points
+        renderer.submit(
+            f"wpn_box_{row.variable}",
+            figures.group_box,
+            df[["group", row.variable]], row.variable, "group",
+            title=f"{row.variable} – WPN vs Other locations",
+            labels={"group": "Group", row.variable: row.variable},
+            annotation=f"{row.test}, p = {row.p_value:.4f}"
+        )
+
+
+def run(data_dir, renderer=None, frames=None):
+    df = prepare(frames or load_inputs(INPUTS, data_dir))
+    results = analyze(df)
+    if renderer is not None:
+        plot(df, results, renderer)
+    return results
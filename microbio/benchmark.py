@@ -0,0 +1,372 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from microbio import datasets, synthetic
+
+# === Benchmark harness ===
+# Runs every analysis stage on synthetic workbooks of growing size and records, per
+# (rows, stage), the best wall time over --repeat runs and the peak traced memory of
+# one extra run under tracemalloc (kept separate so tracing does not skew the times).
+#   python -m microbio.benchmark --sizes 200,1e4,1e5,1e6 --output bench.json
+#   python -m microbio.benchmark --sizes 200,1e4 --compare bench.json   # exit 1 on regression
+# The load stages need real .xlsx files, so they only run up to --excel-max rows
+# (Excel caps a sheet at ~10⁶ rows, and openpyxl needs ~10 s per 10⁴ rows of 4 sheets);
+# larger sizes start from in-memory frames.
+DEFAULT_SIZES = '200,10000,100000'
+DEFAULT_TOLERANCE = 0.25
+MIN_SECONDS = 0.01  # timing noise floor for regression flags
+MIN_MB = 1.0
+
+STAGES = ['load', 'load_cached', 'compact', 'parse', 'genus', 'gram', 'aggregate', 'stats', 'figures']
+
+
+# === Stages ===
+# Each stage takes and extends the shared ``state`` dict and returns the row count it produced.
+def _load(state, cached):
+    from microbio.workbooks import read_sheet
+
+    frames = {}
+    for (workbook, sheet) in state['frames']:
+        frames[(workbook, sheet)] = read_sheet(os.path.join(state['data_dir'], workbook), sheet,
+                                               datasets.SHEET_SCHEMAS[(workbook, sheet)])
+    if cached:
+        state['frames'] = frames
+    return sum(len(f) for f in frames.values())
+
+
+def stage_load(state):
+    """Stream the schema columns with openpyxl (cold: the columnar cache is cleared first)."""
+    import shutil
+
+    shutil.rmtree(os.environ['MICROBIO_CACHE_DIR'], ignore_errors=True)
+    return _load(state, cached=False)
+
+
+def stage_load_cached(state):
+    """Read the same sheets again through the columnar cache."""
+    return _load(state, cached=True)
+
+
+def stage_compact(state):
+    """Schema-driven downcasting of the loaded sheets (--compact runs only)."""
+    from microbio.compact import compact_frame
+
+    frames = state['frames']
+    for key in frames:
+        frames[key] = compact_frame(frames[key], datasets.SHEET_SCHEMAS.get(key))
+    return sum(len(f) for f in frames.values())
+
+
+def stage_parse(state):
+    frames = state['frames']
+    culture = datasets.culture_measurements(frames[(datasets.CULTURE_WORKBOOK, datasets.CULTURE_SHEET)])
+    culture['group'] = datasets.location_group(culture['lokalizacja'])
+    state['culture'] = culture
+    state['pcr'] = datasets.pcr_measurements(frames[(datasets.PCR_WORKBOOK, datasets.PCR_SHEET)])
+    return len(culture) + len(state['pcr'])
+
+
+def stage_genus(state):
+    from microbio.genus_resolver import load_genus_resolver
+    from microbio.taxonomy import extract_genus
+
+    extract_genus.cache_clear()  # measure the cold per-unique cost
+    load_genus_resolver().cache_clear()  # every repeat resolves the names again
+    state['isolates'] = datasets.isolates(state['frames'][(datasets.ISOLATE_WORKBOOK, datasets.ISOLATE_SHEET)])
+    return len(state['isolates'])
+
+
+def stage_gram(state):
+    from microbio.gram import load_gram_registry
+
+    state['gram'] = load_gram_registry().classify(state['isolates']['Rodzaj'])
+    return len(state['gram'])
+
+
+def stage_aggregate(state):
+    from microbio.analyses.method_averages import GENUS_GROUPS, METHOD_LIST, detect_methods
+    from microbio.genus_groups import group_cube
+    from microbio.store import AggregateStore
+
+    store = AggregateStore()
+    store.update_isolates(state['frames'][(datasets.ISOLATE_WORKBOOK, datasets.ISOLATE_SHEET)])
+    store.update_measurements('culture', state['culture'], ['sedimentation', 'pluczka'])
+    store.update_measurements('pcr', state['pcr'], ['qPCR', 'sec', 'regA'])
+    state['cube'] = store.cube()
+    state['means'] = store.measurement_means()
+
+    gram_negative = state['frames'][(datasets.CULTURE_WORKBOOK, datasets.GRAM_NEGATIVE_SHEET)]
+    gram_negative = gram_negative.assign(Method=detect_methods(gram_negative['Metoda poboru']))
+    state['groups'] = group_cube(gram_negative, GENUS_GROUPS, 'Rodzaj/gatunek', 'Miejsce poboru', 'Method',
+                                 synthetic.LOCATIONS, METHOD_LIST)
+    return len(state['cube'].frame) + len(state['groups'])
+
+
+def stage_stats(state):
+    from microbio.bootstrap import bootstrap_ci
+    from microbio.stats import compare_groups
+
+    merged = state['culture'][['group', 'sedimentation']]
+    state['comparison'] = compare_groups(merged, ['sedimentation'], group_col='group')
+    control = merged.loc[merged['group'] == datasets.CONTROL_GROUP, 'sedimentation'].dropna()
+    state['ci'] = bootstrap_ci(control, n_resamples=state['resamples'], seed=0)
+    return len(merged)
+
+
+def stage_figures(state):
+    """Build (not export) one figure of each kind, on the full data."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    from microbio import figures
+
+    built = [figures.group_box(state['culture'], 'sedimentation', 'group', title='benchmark',
+                               labels={}, annotation='')]
+    cube = state['cube']
+    built.append(figures.cycle_sunburst(cube.cycle(cube.cycles[0]), cube.cycles[0]))
+    grouped = cube.medium_genus()
+    medium = grouped['Podloze'].iloc[0]
+    built.append(figures.medium_donut(grouped[grouped['Podloze'] == medium], medium))
+    part = state['groups'][state['groups']['Group'] == 'coliform']
+    built.append(figures.grouped_bar(part, 'Sample_count', 'benchmark', '', synthetic.LOCATIONS,
+                                     ['Sedimentation', 'Rinse', 'Culture']))
+    plt.close('all')
+    return len(built)
+
+
+STAGE_FUNCTIONS = {
+    'load': stage_load,
+    'load_cached': stage_load_cached,
+    'compact': stage_compact,
+    'parse': stage_parse,
+    'genus': stage_genus,
+    'gram': stage_gram,
+    'aggregate': stage_aggregate,
+    'stats': stage_stats,
+    'figures': stage_figures,
+}
+
+# Stages whose output a stage reads; they run (untimed) when only a subset is requested
+STAGE_DEPENDENCIES = {
+    'load_cached': ['load'],
+    'gram': ['genus'],
+    'aggregate': ['parse'],
+    'stats': ['parse'],
+    'figures': ['parse', 'aggregate'],
+}
+
+
+def _with_dependencies(stages):
+    needed = set(stages)
+    for name in stages:
+        needed.update(STAGE_DEPENDENCIES.get(name, []))
+    return [name for name in STAGES if name in needed]
+
+
+# === Runs ===
+def _run_pipeline(frames, data_dir, stages, resamples, trace):
+    state = {'frames': dict(frames), 'data_dir': data_dir, 'resamples': resamples}
+    results = {}
+    for name in _with_dependencies(stages):
+        if name not in stages:
+            STAGE_FUNCTIONS[name](state)
+            continue
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        rows = STAGE_FUNCTIONS[name](state)
+        seconds = time.perf_counter() - start
+        if trace:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[name] = {'peak_mb': round(peak / 2**20, 3)}
+        else:
+            results[name] = {'seconds': seconds, 'rows_out': int(rows)}
+    return results
+
+
+_warmed = False
+
+
+def _warm_up(stages, resamples):
+    """One untimed run on a tiny data set, so imports and first-call setup are not timed."""
+    global _warmed
+    if not _warmed:
+        stages = [s for s in stages if s not in ('load', 'load_cached')]
+        _run_pipeline(synthetic.synthetic_frames(100, seed=1), None, stages, resamples, trace=False)
+        _warmed = True
+
+
+def benchmark_size(n_rows, stages=STAGES, repeat=3, resamples=1000, memory=True, excel_max=20_000, seed=0,
+                   compact=False, quiet=True):
+    """Result records (one per stage) for synthetic data with ``n_rows`` rows per sheet."""
+    frames = synthetic.synthetic_frames(n_rows, seed=seed)
+    records = {}
+    stages = [s for s in stages if s != 'compact'] + (['compact'] if compact else [])
+    skipped = {}
+    if n_rows > min(excel_max, synthetic.EXCEL_MAX_ROWS):
+        for name in ('load', 'load_cached'):
+            if name in stages:
+                stages.remove(name)
+                skipped[name] = f"more than --excel-max ({excel_max}) rows"
+
+    with tempfile.TemporaryDirectory(prefix='microbio-bench-') as data_dir:
+        previous = {key: os.environ.get(key) for key in ('MICROBIO_CACHE_DIR', 'MICROBIO_NO_CACHE', 'MICROBIO_COMPACT')}
+        os.environ['MICROBIO_CACHE_DIR'] = os.path.join(data_dir, 'cache')
+        os.environ.pop('MICROBIO_NO_CACHE', None)
+        if compact:
+            os.environ['MICROBIO_COMPACT'] = '1'
+        else:
+            os.environ.pop('MICROBIO_COMPACT', None)
+        try:
+            if 'load' in stages or 'load_cached' in stages:
+                synthetic.write_workbooks(frames, data_dir)
+
+            # The analyses print progress and reports: keep them out of the benchmark output
+            with contextlib.redirect_stdout(io.StringIO() if quiet else sys.stdout), warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                _warm_up(stages, resamples)
+                timings = [_run_pipeline(frames, data_dir, stages, resamples, trace=False) for _ in range(repeat)]
+                traced = _run_pipeline(frames, data_dir, stages, resamples, trace=True) if memory else {}
+        finally:
+            for key, value in previous.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    for name in STAGES:
+        if name in skipped:
+            records[name] = {'rows': n_rows, 'stage': name, 'skipped': skipped[name]}
+        elif name in stages:
+            seconds = [t[name]['seconds'] for t in timings]
+            records[name] = {
+                'rows': n_rows,
+                'stage': name,
+                'seconds': round(min(seconds), 6),
+                'seconds_median': round(float(np.median(seconds)), 6),
+                'peak_mb': traced.get(name, {}).get('peak_mb'),
+                'rows_out': timings[0][name]['rows_out'],
+            }
+    return list(records.values())
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+# === Baseline comparison ===
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Rows (rows, stage, metric, baseline, current, ratio, regression) for stages in both runs."""
+    previous = {(r['rows'], r['stage']): r for r in baseline['results'] if 'seconds' in r}
+    rows = []
+    for record in results:
+        old = previous.get((record['rows'], record['stage']))
+        if old is None or 'seconds' not in record:
+            continue
+        for metric, floor in (('seconds', MIN_SECONDS), ('peak_mb', MIN_MB)):
+            before, after = old.get(metric), record.get(metric)
+            if before is None or after is None:
+                continue
+            ratio = after / before if before else np.inf
+            rows.append({
+                'rows': record['rows'], 'stage': record['stage'], 'metric': metric,
+                'baseline': before, 'current': after, 'ratio': round(ratio, 3),
+                'regression': bool(ratio > 1 + tolerance and after - before > floor),
+            })
+    return pd.DataFrame(rows, columns=['rows', 'stage', 'metric', 'baseline', 'current', 'ratio', 'regression'])
+
+
+def _sizes(text):
+    return [int(float(s)) for s in text.split(',') if s.strip()]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='microbio-bench', description="Time and memory-profile every analysis "
+                                                                         "stage on synthetic workbooks.")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f"comma-separated rows per sheet, e.g. 200,1e5,1e7 (default: {DEFAULT_SIZES})")
+    parser.add_argument('--stages', default=','.join(STAGES), help="comma-separated subset of: " + ', '.join(STAGES))
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per size, the best one is kept")
+    parser.add_argument('--resamples', type=int, default=1000, help="bootstrap resamples in the stats stage")
+    parser.add_argument('--excel-max', type=float, default=20_000,
+                        help="largest size for which .xlsx files are written and the load stages run")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc run")
+    parser.add_argument('--compact', action='store_true', help="run with compact dtypes (adds the compact stage)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', metavar='JSON', help="write the results here")
+    parser.add_argument('--compare', metavar='JSON', help="baseline results to flag regressions against")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed slowdown/growth before a regression is flagged (default: {DEFAULT_TOLERANCE})")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(sys.argv[1:] if argv is None else argv)
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise SystemExit(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+
+    results = []
+    for n_rows in _sizes(args.sizes):
+        print(f"⏱️ {n_rows:,} rows per sheet")
+        for record in benchmark_size(n_rows, stages, args.repeat, args.resamples, not args.no_memory,
+                                     int(args.excel_max), args.seed, args.compact):
+            results.append(record)
+            if 'skipped' in record:
+                print(f"   {record['stage']:<12} skipped ({record['skipped']})")
+            else:
+                memory = f"{record['peak_mb']:10.1f} MB" if record['peak_mb'] is not None else ''
+                print(f"   {record['stage']:<12} {record['seconds']:10.4f} s {memory}")
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'settings': {'repeat': args.repeat, 'resamples': args.resamples, 'seed': args.seed,
+                     'compact': args.compact},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, ensure_ascii=False, indent=2)
+        print(f"📄 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+        table = compare(results, baseline, args.tolerance)
+        if table.empty:
+            print("⚠️ No (rows, stage) pairs in common with the baseline")
+            return 0
+        print(table.to_string(index=False))
+        regressions = table[table['regression']]
+        if len(regressions):
+            print(f"❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%} of {args.compare}")
+            return 1
+        print(f"✅ No regressions beyond {args.tolerance:.0%} of {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
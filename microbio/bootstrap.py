@@ -0,0 +1,114 @@
+import warnings
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from microbio.tracing import traced
+
+# === Vectorized bootstrap / permutation ===
+# Resamples are drawn as integer index matrices (resamples × n) and reduced with NumPy
+# along axis 1. Matrices are generated in chunks sized by ``max_chunk_bytes`` so 10⁶
+# resamples of a large control group never need more than a bounded working set.
+DEFAULT_RESAMPLES = 10_000
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+STATISTICS = ('mean', 'sd', 'cv')
+
+
+def _chunks(n_resamples, row_bytes, max_chunk_bytes):
+    rows = max(1, int(max_chunk_bytes // max(row_bytes, 1)))
+    for start in range(0, n_resamples, rows):
+        yield min(rows, n_resamples - start)
+
+
+def _mean_sd_cv(samples):
+    mean = samples.mean(axis=1)
+    sd = samples.std(axis=1, ddof=1) if samples.shape[1] > 1 else np.full(len(samples), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cv = np.where(mean != 0, sd / mean * 100, np.nan)
+    return np.column_stack([mean, sd, cv])
+
+
+def bootstrap_distribution(values, n_resamples=DEFAULT_RESAMPLES, seed=None,
+                           max_chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Bootstrap replicates of mean, SD (ddof=1) and CV% as an (n_resamples × 3) array."""
+    x = np.asarray(values, dtype=np.float64)
+    x = x[~np.isnan(x)]
+    n = len(x)
+    rng = np.random.default_rng(seed)
+    out = np.empty((n_resamples, len(STATISTICS)))
+    if n == 0:
+        out.fill(np.nan)
+        return out
+    done = 0
+    # index matrix (int64) + gathered values (float64) per resample row
+    for rows in _chunks(n_resamples, 16 * n, max_chunk_bytes):
+        idx = rng.integers(0, n, size=(rows, n))
+        out[done:done + rows] = _mean_sd_cv(x[idx])
+        done += rows
+    return out
+
+
+@traced('bootstrap_ci', 'stats')
+def bootstrap_ci(values, n_resamples=DEFAULT_RESAMPLES, confidence=0.95, seed=None,
+                 max_chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Percentile bootstrap CIs for the mean, SD and CV% of one sample.
+
+    Returns a frame indexed by statistic with estimate, ci_low and ci_high.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    x = x[~np.isnan(x)]
+    estimate = _mean_sd_cv(x[None, :])[0] if len(x) else np.full(len(STATISTICS), np.nan)
+    reps = bootstrap_distribution(x, n_resamples, seed, max_chunk_bytes)
+    alpha = (1 - confidence) / 2
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # SD/CV undefined for n < 2
+        low, high = np.nanquantile(reps, [alpha, 1 - alpha], axis=0)
+    return pd.DataFrame({'n': len(x), 'estimate': estimate, 'ci_low': low, 'ci_high': high},
+                        index=pd.Index(STATISTICS, name='statistic'))
+
+
+def bootstrap_groups(df, value_col, group_cols, n_resamples=DEFAULT_RESAMPLES, confidence=0.95,
+                     seed=None, max_chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """``bootstrap_ci`` for every group (e.g. per control site and method), as one tidy table.
+
+    Each group gets its own child seed of ``seed``, so results do not depend on which
+    other groups are present.
+    """
+    group_cols = list(group_cols) if isinstance(group_cols, (list, tuple)) else [group_cols]
+    frames = []
+    for key, part in df.groupby(group_cols, observed=True, sort=True):
+        key = key if isinstance(key, tuple) else (key,)
+        spawn_key = tuple(zlib.crc32(str(k).encode('utf-8')) for k in key)
+        group_seed = np.random.SeedSequence(seed, spawn_key=spawn_key)
+        res = bootstrap_ci(part[value_col], n_resamples, confidence, group_seed, max_chunk_bytes).reset_index()
+        for col, value in reversed(list(zip(group_cols, key))):
+            res.insert(0, col, value)
+        frames.append(res)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def permutation_test(a, b, n_resamples=DEFAULT_RESAMPLES, alternative='less', seed=None,
+                     max_chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Permutation p-value for mean(a) - mean(b); ``alternative`` as in scipy."""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    a, b = a[~np.isnan(a)], b[~np.isnan(b)]
+    if not len(a) or not len(b):
+        return np.nan, np.nan
+    pooled = np.concatenate([a, b])
+    n_a = len(a)
+    observed = a.mean() - b.mean()
+    rng = np.random.default_rng(seed)
+    hits = 0
+    for rows in _chunks(n_resamples, 16 * len(pooled), max_chunk_bytes):
+        perm = rng.permuted(np.broadcast_to(pooled, (rows, len(pooled))), axis=1)
+        diff = perm[:, :n_a].mean(axis=1) - perm[:, n_a:].mean(axis=1)
+        if alternative == 'less':
+            hits += np.count_nonzero(diff <= observed)
+        elif alternative == 'greater':
+            hits += np.count_nonzero(diff >= observed)
+        else:
+            hits += np.count_nonzero(np.abs(diff) >= abs(observed))
+    # +1 correction so the p-value is never exactly 0
+    return observed, (hits + 1) / (n_resamples + 1)
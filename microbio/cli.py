@@ -0,0 +1,137 @@
+import argparse
+import os
+import sys
+
+from microbio import tracing
+from microbio.analyses import ANALYSES, load_analysis
+from microbio.render import add_render_arguments, renderer_from_args
+
+# Workbooks live next to the package in this repository
+DEFAULT_DATA_DIR = os.environ.get('MICROBIO_DATA_DIR') or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='microbio', description="Air microbiology analyses.")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR,
+                        help="directory with the lab workbooks (env: MICROBIO_DATA_DIR)")
+    parser.add_argument('--inputs', metavar='DIR|GLOB', default=os.environ.get('MICROBIO_INPUTS'),
+                        help="read every campaign workbook under DIR (or matching GLOB) in parallel instead of "
+                             "the single workbooks in --data-dir (env: MICROBIO_INPUTS)")
+    parser.add_argument('--ingest-workers', type=int, default=int(os.environ.get('MICROBIO_INGEST_WORKERS', 0)) or None,
+                        help="processes reading workbooks with --inputs, default: all cores "
+                             "(env: MICROBIO_INGEST_WORKERS)")
+    parser.add_argument('--rebuild-store', action='store_true',
+                        help="discard the persisted aggregates and recompute them from all rows")
+    parser.add_argument('--compact', action='store_true', default=bool(os.environ.get('MICROBIO_COMPACT')),
+                        help="keep only the needed columns with compact dtypes and report the memory saved "
+                             "(env: MICROBIO_COMPACT)")
+    parser.add_argument('--trace', metavar='FILE', default=os.environ.get('MICROBIO_TRACE'),
+                        help="write a Chrome-trace timeline of the pipeline stages to FILE (env: MICROBIO_TRACE)")
+    parser.add_argument('--trace-memory', action='store_true', default=bool(os.environ.get('MICROBIO_TRACE_MEMORY')),
+                        help="also record tracemalloc peaks per stage; slower (env: MICROBIO_TRACE_MEMORY)")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--no-plots', action='store_true',
+                        help="print statistics only, without building figures")
+    add_render_arguments(common)
+
+    subparsers = parser.add_subparsers(dest='command', metavar='command', required=True)
+    for name, (_, help_text) in ANALYSES.items():
+        subparsers.add_parser(name, help=help_text, description=help_text, parents=[common])
+
+    from microbio import watch
+
+    help_text = "rerun analyses when their workbooks change and serve the figures as a live dashboard"
+    watcher = subparsers.add_parser('watch', help=help_text, description=help_text)
+    watcher.add_argument('analyses', nargs='*', metavar='analysis',
+                         help="analyses to keep up to date, default: all")
+    watcher.add_argument('--batch', metavar='DIR', default=os.environ.get('MICROBIO_BATCH_DIR'),
+                         help="dashboard directory, default: a temporary one (env: MICROBIO_BATCH_DIR)")
+    watcher.add_argument('--port', type=int, default=watch.DEFAULT_PORT,
+                         help=f"local HTTP port for the dashboard, 0 for any free one (default: {watch.DEFAULT_PORT})")
+    watcher.add_argument('--interval', type=float, default=watch.DEFAULT_INTERVAL,
+                         help=f"seconds between workbook checks (default: {watch.DEFAULT_INTERVAL})")
+    watcher.add_argument('--debounce', type=float, default=watch.DEFAULT_DEBOUNCE,
+                         help="seconds a saved workbook must stay unchanged before it is re-read "
+                              f"(default: {watch.DEFAULT_DEBOUNCE})")
+    watcher.add_argument('--workers', type=int, default=int(os.environ.get('MICROBIO_WORKERS', 0)) or None,
+                         help="export processes, default: all cores (env: MICROBIO_WORKERS)")
+
+    help_text = "totals, breakdowns or rows of the indexed isolate and measurement tables"
+    query = subparsers.add_parser('query', help=help_text, description=help_text)
+    query.add_argument('table', choices=['isolates', 'gram_negative', 'measurements'],
+                       help="isolates: cycle/location/medium/genus/gram; gram_negative: location/method/genus; "
+                            "measurements: source/location/method")
+    query.add_argument('where', nargs='*', metavar='key=value',
+                       help="criteria; 'a,b' selects several labels and 'a..b' an inclusive range")
+    query.add_argument('--by', metavar='KEY[,KEY]', help="break the totals down by these keys")
+    query.add_argument('--rows', action='store_true', help="print the matching aggregated rows")
+    return parser
+
+
+def run_query(parser, args, data_dir):
+    from microbio.query import open_query, parse_criterion, table_inputs
+
+    try:
+        where = dict(parse_criterion(text) for text in args.where)
+    except ValueError as e:
+        parser.error(str(e))
+    with tracing.span('query', 'command'):
+        frames = None
+        if args.inputs:
+            from microbio.ingest import ingest
+
+            frames = ingest(table_inputs([args.table]), args.inputs, workers=args.ingest_workers)
+        table = open_query(data_dir, [args.table], frames)[args.table]
+        try:
+            if args.rows:
+                print(table.rows(**where).to_string(index=False))
+            elif args.by:
+                print(table.breakdown(args.by.split(','), **where).to_string(index=False))
+            else:
+                print(table.total(**where).to_string())
+        except (KeyError, ValueError) as e:
+            parser.error(e.args[0])
+    tracing.finish()
+    return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    if args.compact:
+        os.environ['MICROBIO_COMPACT'] = '1'  # read at load time, also by export workers
+    if args.trace:
+        tracing.enable(args.trace, memory=args.trace_memory)
+    if args.command == 'watch':
+        unknown = [name for name in args.analyses if name not in ANALYSES]
+        if unknown:
+            parser.error(f"unknown analysis {', '.join(unknown)} (choose from {', '.join(ANALYSES)})")
+        if args.inputs:
+            parser.error("watch reads the workbooks in --data-dir, not --inputs")
+        from microbio.watch import watch
+
+        return watch(args.data_dir, args.analyses, args.batch, args.port, args.interval, args.debounce,
+                     args.workers)
+    data_dir = args.data_dir
+    if args.inputs:
+        from microbio.ingest import find_workbooks, ingest
+
+        data_dir = find_workbooks(args.inputs)[0]  # the campaigns get their own aggregate store
+    if args.rebuild_store:
+        from microbio.store import store_path
+
+        if os.path.exists(store_path(data_dir)):
+            os.remove(store_path(data_dir))
+    if args.command == 'query':
+        return run_query(parser, args, data_dir)
+
+    renderer = None if args.no_plots else renderer_from_args(args)
+    with tracing.span(args.command, 'command'):
+        analysis = load_analysis(args.command)
+        frames = ingest(analysis.INPUTS, args.inputs, workers=args.ingest_workers) if args.inputs else None
+        analysis.run(data_dir, renderer, frames)
+        if renderer is not None:
+            renderer.finish()
+    tracing.finish()
+    return 0
@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# === Compact dtypes ===
+# With MICROBIO_COMPACT set (microbio --compact) sheets are shrunk right after load:
+# only the columns listed in the sheet's schema (datasets.SHEET_SCHEMAS) are kept,
+# repeated text becomes Categorical, and numbers become float32/int32 when every value
+# survives the round trip (relative error ≤ FLOAT32_RTOL). Parsed measurement frames
+# get the same treatment. Sums and means are still accumulated in float64.
+FLOAT32_RTOL = 1e-6
+CATEGORY_MAX_RATIO = 0.5  # text columns with at most this share of distinct values
+
+
+def compact_enabled():
+    return bool(os.environ.get('MICROBIO_COMPACT'))
+
+
+def frame_mb(df):
+    return df.memory_usage(deep=True, index=False).sum() / 2**20
+
+
+def _float32(values):
+    f32 = values.astype(np.float32)
+    with np.errstate(invalid='ignore', over='ignore'):
+        same = np.isclose(f32, values, rtol=FLOAT32_RTOL, atol=0, equal_nan=True)
+    return f32 if same.all() else None
+
+
+def downcast(series, kind=None):
+    """Smaller dtype for one column: ``kind`` 'category' or 'number' forces the choice,
+    None picks Categorical for repeated text and float32/int32 where values allow."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype):
+        return series
+    if kind == 'category':
+        return series.astype('category')
+    if pd.api.types.is_integer_dtype(dtype):
+        info = np.iinfo(np.int32)
+        if len(series) == 0 or (series.min() >= info.min and series.max() <= info.max):
+            return series.astype(np.int32)
+        return series
+    if pd.api.types.is_float_dtype(dtype):
+        f32 = _float32(series.to_numpy(dtype=np.float64, na_value=np.nan))
+        return series if f32 is None else pd.Series(f32, index=series.index, name=series.name)
+    if kind == 'number':
+        numbers = pd.to_numeric(series, errors='coerce')
+        if numbers.notna().sum() == series.notna().sum():
+            return downcast(numbers)
+        return series
+    if len(series) and series.nunique(dropna=True) <= CATEGORY_MAX_RATIO * len(series):
+        return series.astype('category')
+    return series
+
+
+def compact_frame(df, schema=None):
+    """Downcast every column; with a ``schema`` ({column: kind}) keep only its columns.
+
+    Schema columns are matched after stripping header whitespace, and missing ones
+    are ignored, so the schema also fits sheets that lack optional columns.
+    """
+    if schema is not None:
+        stripped = {str(col).strip(): col for col in df.columns}
+        df = df[[stripped[col] for col in schema if col in stripped]]
+    else:
+        schema = {}
+    return pd.DataFrame({col: downcast(df[col], schema.get(str(col).strip())) for col in df.columns},
+                        index=df.index)
+
+
+def memory_report(label, before, after):
+    """One-line before/after memory comparison for a compacted frame."""
+    mb_before, mb_after = frame_mb(before), frame_mb(after)
+    ratio = mb_before / mb_after if mb_after else float('inf')
+    print(f"🗜️ {label}: {len(before.columns)} → {len(after.columns)} columns, "
+          f"{mb_before:.3g} → {mb_after:.3g} MB ({ratio:.1f}× smaller)")
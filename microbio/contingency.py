@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from microbio.store import cycle_sort_key
+from microbio.tracing import traced
+
+# === Sparse contingency tables ===
+# Isolate counts as one scipy.sparse matrix per question (e.g. medium × genus), with
+# the strata (sampling cycles) stacked as row blocks: row = stratum · n_rows + row code.
+# Built straight from factor codes, so memory follows the observed (row, genus) pairs
+# however many genera the taxonomy has. Independence tests for every stratum come from
+# the nonzero entries alone:
+#   χ² = N · Σ O² / (R · C) − N        G = 2 Σ O · ln(O · N / (R · C))
+# with (r − 1)(c − 1) degrees of freedom over the stratum's non-empty rows and columns
+# (absent categories do not count, as if the stratum's table were built on its own).
+# Strata are listed in cycle order (I, II, ..., IX, X), as in every other report.
+
+
+def _codes(values, order=None):
+    """Factor codes and labels; labels sorted by ``order`` (a sort key) or by value."""
+    values = pd.Series(values, copy=False)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), pd.Index(values.cat.categories)
+    if order is None:
+        codes, uniques = pd.factorize(values, sort=True)
+        return codes, pd.Index(uniques)
+    codes, uniques = pd.factorize(values)
+    ranked = np.array(sorted(range(len(uniques)), key=lambda i: order(uniques[i])), dtype=np.int64)
+    remap = np.empty(len(uniques), dtype=np.int64)
+    remap[ranked] = np.arange(len(uniques))
+    return np.where(codes >= 0, remap[np.maximum(codes, 0)], -1), pd.Index(uniques[ranked])
+
+
+class ContingencyTable:
+    """Stacked sparse (stratum × row) × column count matrix with its labels."""
+
+    def __init__(self, counts, row_labels, column_labels, strata):
+        self.counts = counts
+        self.row_labels = row_labels
+        self.column_labels = column_labels
+        self.strata = strata
+
+    @classmethod
+    def from_codes(cls, row_codes, column_codes, stratum_codes, weights, row_labels, column_labels, strata):
+        from scipy import sparse
+
+        n_rows = len(row_labels)
+        keep = (row_codes >= 0) & (column_codes >= 0) & (stratum_codes >= 0)
+        rows = stratum_codes[keep].astype(np.int64) * n_rows + row_codes[keep]
+        counts = sparse.csr_matrix((np.asarray(weights)[keep].astype(np.int64), (rows, column_codes[keep])),
+                                   shape=(len(strata) * n_rows, len(column_labels)))
+        counts.sum_duplicates()
+        counts.eliminate_zeros()
+        return cls(counts, row_labels, column_labels, strata)
+
+    @classmethod
+    def from_frame(cls, df, row, column, stratum=None, count=None, stratum_order=cycle_sort_key):
+        """Table of ``row`` × ``column`` per ``stratum`` from isolate rows or, with ``count``, grouped counts."""
+        row_codes, row_labels = _codes(df[row])
+        column_codes, column_labels = _codes(df[column])
+        if stratum is None:
+            stratum_codes, strata = np.zeros(len(df), dtype=np.int64), pd.Index(['all'])
+        else:
+            stratum_codes, strata = _codes(df[stratum], stratum_order)
+        weights = np.ones(len(df), dtype=np.int64) if count is None else df[count].to_numpy()
+        return cls.from_codes(row_codes, column_codes, stratum_codes, weights, row_labels, column_labels, strata)
+
+    def dense(self, stratum):
+        """One stratum as a DataFrame over its non-empty rows and columns."""
+        n_rows = len(self.row_labels)
+        s = self.strata.get_loc(stratum)
+        block = self.counts[s * n_rows:(s + 1) * n_rows]
+        rows = np.flatnonzero(np.diff(block.indptr))
+        columns = np.unique(block.indices)
+        return pd.DataFrame(block[rows][:, columns].toarray(), index=self.row_labels[rows],
+                            columns=self.column_labels[columns])
+
+    @traced('contingency.independence', 'stats')
+    def independence(self):
+        """χ² and G-test of row–column independence for every stratum, as one frame."""
+        from scipy.stats import chi2
+
+        n_rows, n_strata = len(self.row_labels), len(self.strata)
+        counts = self.counts.tocoo()
+        observed = counts.data.astype(np.float64)
+        stratum = counts.row // n_rows
+        row_total = np.bincount(counts.row, observed, minlength=counts.shape[0])
+        column_key = stratum * len(self.column_labels) + counts.col
+        column_total = np.bincount(column_key, observed, minlength=n_strata * len(self.column_labels))
+        total = np.bincount(stratum, observed, minlength=n_strata)
+
+        product = row_total[counts.row] * column_total[column_key]  # R · C per observed cell
+        chi_square = total * np.bincount(stratum, observed ** 2 / product, minlength=n_strata) - total
+        g = 2 * np.bincount(stratum, observed * np.log(observed * total[stratum] / product), minlength=n_strata)
+
+        block_rows = row_total.reshape(n_strata, n_rows)
+        block_columns = column_total.reshape(n_strata, -1)
+        r = (block_rows > 0).sum(axis=1)
+        c = (block_columns > 0).sum(axis=1)
+        dof = (r - 1) * (c - 1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            smallest_row = np.where(block_rows > 0, block_rows, np.inf).min(axis=1)
+            smallest_column = np.where(block_columns > 0, block_columns, np.inf).min(axis=1)
+            testable = dof > 0
+            return pd.DataFrame({
+                'stratum': self.strata,
+                'n': total.astype(np.int64),
+                'rows': r,
+                'columns': c,
+                'dof': dof,
+                'chi2': np.where(testable, chi_square, np.nan),
+                'p_chi2': np.where(testable, chi2.sf(chi_square, np.maximum(dof, 1)), np.nan),
+                'G': np.where(testable, g, np.nan),
+                'p_G': np.where(testable, chi2.sf(g, np.maximum(dof, 1)), np.nan),
+                'cramers_v': np.where(testable, np.sqrt(chi_square / (total * (np.minimum(r, c) - 1))), np.nan),
+                'min_expected': np.where(testable, smallest_row * smallest_column / total, np.nan),
+            })
+
+
+def independence_tests(counts, row, column, stratum='cycle', count='count'):
+    """``row`` vs ``column`` χ²/G-tests per ``stratum`` from grouped counts (e.g. the aggregate store)."""
+    tests = ContingencyTable.from_frame(counts, row, column, stratum, count).independence()
+    return tests.rename(columns={'stratum': stratum}) if stratum else tests
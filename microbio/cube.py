@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from microbio.gram import load_gram_registry
+
+# === Hierarchical isolate count cube ===
+# One groupby over (cycle, Localization, Podloze, Rodzaj, Typ Grama) for all cycles,
+# with per-cycle percentages and sunburst labels built as whole-column string ops.
+# Rows are sorted by cycle, so a cycle's figure data is a positional slice of the
+# cube (no boolean mask, no copy). Medium donuts aggregate the same cube.
+LEVELS = ['cycle', 'Localization', 'Podloze', 'Rodzaj', 'Typ Grama']
+
+
+class IsolateCube:
+    def __init__(self, frame, cycles):
+        self.frame = frame
+        self.cycles = cycles
+        codes = frame['cycle'].cat.codes.to_numpy()
+        starts = np.searchsorted(codes, np.arange(len(cycles)), side='left')
+        stops = np.searchsorted(codes, np.arange(len(cycles)), side='right')
+        self._bounds = {c: (a, b) for c, a, b in zip(cycles, starts, stops)}
+
+    @classmethod
+    def from_counts(cls, counts, cycle_order=None):
+        """Cube from (cycle, location, medium, genus, count) rows, e.g. the aggregate store."""
+        cycles = sorted(counts['cycle'].unique(), key=cycle_order)
+        df = pd.DataFrame({
+            'cycle': pd.Categorical(counts['cycle'], categories=cycles, ordered=True),
+            'Localization': counts['location'].to_numpy(),
+            'Podloze': counts['medium'].to_numpy(),
+            'Rodzaj': counts['genus'].to_numpy(),
+            # Classify Gram (registry lookup once per genus)
+            'Typ Grama': np.asarray(load_gram_registry().classify(counts['genus']), dtype=object),
+            'count': counts['count'].to_numpy(),
+        })
+        cube = df.groupby(LEVELS, observed=True, sort=True)['count'].sum().reset_index()
+
+        # % of the cycle's isolates
+        cube['percent'] = (cube['count'] / cube.groupby('cycle', observed=True)['count'].transform('sum') * 100).round(1)
+
+        # Label for Rodzaj (Genus)
+        has_genus = cube['Rodzaj'] != ''
+        label = cube['Rodzaj'] + ' (' + cube['Podloze'] + ') – ' + cube['percent'].astype(str) + '%'
+        cube['Rodzaj_label'] = label.where(has_genus, 'Unidentified')
+        return cls(cube, cycles)
+
+    def cycle(self, cycle):
+        """Rows of one cycle as a positional slice of the cube."""
+        start, stop = self._bounds[cycle]
+        return self.frame.iloc[start:stop]
+
+    def medium_genus(self, cycles=None):
+        """Isolates per (Podloze, Rodzaj) with % of the medium, over all or the given cycles."""
+        frame = self.frame if cycles is None else self.frame[self.frame['cycle'].isin(cycles)]
+        grouped = frame.groupby(['Podloze', 'Rodzaj'])['count'].sum().reset_index()
+        grouped['percent'] = (grouped['count'] / grouped.groupby('Podloze')['count'].transform('sum') * 100).round(3)
+        return grouped
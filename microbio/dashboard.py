@@ -0,0 +1,165 @@
+import hashlib
+import html
+import json
+import os
+from datetime import datetime
+
+# === Single-page report ===
+# The 'dashboard' export format writes each plotly figure as compact JSON (matplotlib
+# figures as png) and Renderer.finish() assembles every figure listed in the output
+# directory's manifest into DIR/dashboard.html: one tab per analysis, plotly.js
+# included once, figure JSON embedded as inert <script type="application/json">
+# blocks and only parsed and plotted when its tab is opened and it scrolls into view.
+# The default plotly template (~7 KB per figure) is stored once and shared.
+# MICROBIO_PLOTLYJS=cdn links plotly.js from the CDN instead of inlining it (~4.6 MB).
+# Served by `microbio watch`, the page polls /version and reloads on the open tab
+# when the figures were refreshed.
+DASHBOARD_FILE = 'dashboard.html'
+FIGURE_SUFFIX = '.plotly.json'
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 0; }}
+header {{ padding: 8px 16px; background: #f4f4f4; border-bottom: 1px solid #ddd; }}
+nav button {{ border: 0; background: none; padding: 8px 12px; cursor: pointer; font-size: 14px; }}
+nav button.active {{ border-bottom: 3px solid #1f77b4; font-weight: bold; }}
+section {{ display: none; padding: 16px; }}
+section.active {{ display: block; }}
+.figure {{ min-height: 480px; margin-bottom: 24px; }}
+.figure img {{ max-width: 100%; }}
+small {{ color: #666; }}
+</style>
+{plotlyjs}
+</head>
+<body>
+<header><strong>{title}</strong> <small>{created} · {count} figure(s)</small>
+<nav>{tabs}</nav></header>
+{sections}
+<script type="application/json" id="templates">{templates}</script>
+<script>
+(function () {{
+  var templates = JSON.parse(document.getElementById('templates').textContent);
+  var observer = new IntersectionObserver(function (entries) {{
+    entries.forEach(function (entry) {{
+      if (!entry.isIntersecting) return;
+      var div = entry.target;
+      observer.unobserve(div);
+      var fig = JSON.parse(document.getElementById(div.dataset.source).textContent);
+      if (fig.template) {{ fig.layout.template = templates[fig.template]; }}
+      Plotly.newPlot(div, fig.data, fig.layout, {{responsive: true}});
+    }});
+  }}, {{rootMargin: '200px'}});
+  function show(name) {{
+    history.replaceState(null, '', '#' + name);
+    document.querySelectorAll('nav button').forEach(function (b) {{
+      b.classList.toggle('active', b.dataset.section === name);
+    }});
+    document.querySelectorAll('section').forEach(function (s) {{
+      var active = s.id === name;
+      s.classList.toggle('active', active);
+      if (active) s.querySelectorAll('div.plotly-pending').forEach(function (div) {{
+        div.classList.remove('plotly-pending');
+        observer.observe(div);
+      }});
+    }});
+  }}
+  document.querySelectorAll('nav button').forEach(function (b) {{
+    b.addEventListener('click', function () {{ show(b.dataset.section); }});
+  }});
+  var first = document.querySelector('nav button');
+  var current = document.getElementById(location.hash.slice(1));
+  if (current && current.tagName === 'SECTION') show(current.id);
+  else if (first) show(first.dataset.section);
+  if (location.protocol.indexOf('http') === 0) {{
+    var version = null;
+    var poll = setInterval(function () {{
+      fetch('version', {{cache: 'no-store'}}).then(function (r) {{
+        if (!r.ok) {{ clearInterval(poll); return null; }}
+        return r.text();
+      }}).then(function (text) {{
+        if (text === null) return;
+        if (version !== null && text !== version) location.reload();
+        version = text;
+      }}).catch(function () {{}});
+    }}, 2000);
+  }}
+}})();
+</script>
+</body>
+</html>
+"""
+
+
+def _plotlyjs():
+    if os.environ.get('MICROBIO_PLOTLYJS', 'inline').lower() == 'cdn':
+        import plotly
+
+        return f'<script src="https://cdn.plot.ly/plotly-{plotly.__version__}.min.js" charset="utf-8"></script>'
+    from plotly.offline import get_plotlyjs
+
+    return f'<script type="text/javascript">{get_plotlyjs()}</script>'
+
+
+def _embed(text):
+    # JSON inside <script>: only '</' can end the element early
+    return text.replace('</', '<\\/')
+
+
+def write_dashboard(output_dir, records, title="Air microbiology report"):
+    """Assemble ``DIR/dashboard.html`` from manifest records; returns its path."""
+    sections = {}
+    for record in records:
+        sections.setdefault(record.get('section') or 'figures', []).append(record)
+
+    templates = {}
+    tabs, bodies, count = [], [], 0
+    for s, (section, items) in enumerate(sections.items()):
+        section_id = f"section-{s}"
+        tabs.append(f'<button data-section="{section_id}">{html.escape(section)}</button>')
+        blocks = []
+        for record in items:
+            name = html.escape(record['name'])
+            for filename in record.get('files', []):
+                path = os.path.join(output_dir, filename)
+                if filename.endswith(FIGURE_SUFFIX) and os.path.exists(path):
+                    with open(path, encoding='utf-8') as fh:
+                        fig = json.load(fh)
+                    template = fig.get('layout', {}).pop('template', None)
+                    if template is not None:
+                        text = json.dumps(template, separators=(',', ':'), sort_keys=True)
+                        key = hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+                        templates[key] = template
+                        fig['template'] = key
+                    source = f"fig-{count}"
+                    blocks.append(
+                        f'<script type="application/json" id="{source}">'
+                        f'{_embed(json.dumps(fig, separators=(",", ":")))}</script>\n'
+                        f'<div class="figure plotly-pending" data-source="{source}" title="{name}"></div>')
+                elif filename.endswith('.png'):
+                    blocks.append(f'<div class="figure"><img src="{html.escape(filename)}" alt="{name}" '
+                                  f'loading="lazy"></div>')
+                else:
+                    continue
+                count += 1
+                break  # one rendering per figure
+        bodies.append(f'<section id="{section_id}">\n' + '\n'.join(blocks) + '\n</section>')
+
+    page = _PAGE.format(
+        title=html.escape(title),
+        created=datetime.now().isoformat(timespec='seconds'),
+        count=count,
+        plotlyjs=_plotlyjs(),
+        tabs=''.join(tabs),
+        sections='\n'.join(bodies),
+        templates=_embed(json.dumps(templates, separators=(',', ':'))),
+    )
+    path = os.path.join(output_dir, DASHBOARD_FILE)
+    tmp = path + f".{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        fh.write(page)
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+from microbio.compact import compact_enabled, compact_frame
+from microbio.locations import CONTROL_GROUP, OTHER_GROUP, load_location_registry
+from microbio.parsing import parse_scientific, report_rejected
+from microbio.taxonomy import genus_column
+
+# === Workbooks and sheets ===
+CULTURE_WORKBOOK = 'Wyniki_powietrze-3.xlsx'
+CULTURE_SHEET = 'Powietrze zewnętrzne-dane'
+GRAM_NEGATIVE_SHEET = 'Powietrze zewnątrz-G(-)'
+PCR_WORKBOOK = 'podsumowanie obliczeń dPCR, qPCR.xlsx'
+PCR_SHEET = 'Arkusz1'
+ISOLATE_WORKBOOK = 'G-.xlsx'
+ISOLATE_SHEET = 'Arkusz1'
+
+# === Column names ===
+SEDIMENTATION_COLUMN = 'Ogólna Liczba drobnoustrojów/m3 -sedymentacja'
+SCRUBBER_COLUMN = 'Ogólna liczba drobnoustrojów/m3-płuczka'
+PCR_COLUMNS = {
+    'Lokalizacja': 'lokalizacja',
+    'qPCR Starting Quantity (SQ) Mean': 'qPCR',
+    'sec, mean DNA amount for m3': 'sec',
+    'regA, mean DNA amount for m3': 'regA',
+}
+SPECIES_COLUMN = 'Rodzaj/gatunek (po czyszczeniu)'
+MEDIUM_COLUMN = 'Podłoże z którego wyhodowano/morfologia kolonii'
+
+# === Columns the analyses read, per sheet (compact mode keeps only these) ===
+# 'category': repeated labels and cell texts (measurements are parsed once per distinct
+# text); 'number': numeric columns, stored as float32 when precision allows.
+SHEET_SCHEMAS = {
+    (CULTURE_WORKBOOK, CULTURE_SHEET): {
+        'lokalizacja': 'category',
+        SEDIMENTATION_COLUMN: 'category',
+        SCRUBBER_COLUMN: 'category',
+    },
+    (CULTURE_WORKBOOK, GRAM_NEGATIVE_SHEET): {
+        'Miejsce poboru': 'category',
+        'Metoda poboru': 'category',
+        'Rodzaj/gatunek': 'category',
+    },
+    (PCR_WORKBOOK, PCR_SHEET): {
+        'Lokalizacja': 'category',
+        'qPCR Starting Quantity (SQ) Mean': 'number',
+        'sec, mean DNA amount for m3': 'number',
+        'regA, mean DNA amount for m3': 'number',
+    },
+    (ISOLATE_WORKBOOK, ISOLATE_SHEET): {
+        'Pobór': 'category',
+        'Miejsce_poboru': 'category',
+        MEDIUM_COLUMN: 'category',
+        SPECIES_COLUMN: 'category',
+    },
+}
+
+
+def location_group(locations):
+    """'WPN (control)' for control sites, 'Other locations' otherwise (registry lookup)."""
+    locations = pd.Series(locations, copy=False)
+    registry = load_location_registry()
+    if not isinstance(locations.dtype, pd.CategoricalDtype):
+        locations = pd.Series(registry.resolve(locations), index=locations.index)
+    groups = pd.Series(registry.group(locations), index=locations.index)
+    return groups.astype('category') if compact_enabled() else groups
+
+
+def with_location(out, raw_locations):
+    """Set canonical 'lokalizacja' (shared Categorical) and integer 'location_id' columns."""
+    registry = load_location_registry()
+    out['lokalizacja'] = registry.resolve(raw_locations)
+    out['location_id'] = registry.ids(out['lokalizacja'])
+    registry.report_unresolved()
+    return out
+
+
+def _parsed(df, source, target):
+    parsed = parse_scientific(df[source])
+    report_rejected(parsed, target)
+    return parsed.values
+
+
+def culture_measurements(df, scrubber=True):
+    """lokalizacja + parsed sedimentation (and scrubber) counts per m³ from the culture sheet."""
+    out = with_location(pd.DataFrame(index=df.index), df['lokalizacja'])
+    out['sedimentation'] = _parsed(df, SEDIMENTATION_COLUMN, 'sedimentation')
+    if scrubber:
+        out['pluczka'] = _parsed(df, SCRUBBER_COLUMN, 'pluczka')
+    return compact_frame(out) if compact_enabled() else out
+
+
+def pcr_measurements(df):
+    """lokalizacja + parsed qPCR, sec and regA amounts from the qPCR/dPCR summary."""
+    out = df[list(PCR_COLUMNS)].rename(columns=PCR_COLUMNS)
+    out = with_location(out, out['lokalizacja'])
+    for col in ['qPCR', 'sec', 'regA']:
+        out[col] = _parsed(out, col, col)
+    return compact_frame(out) if compact_enabled() else out
+
+
+# Normalize medium names
+def normalize_podloze(raw):
+    if pd.isnull(raw): return 'nieznane'
+    s = str(raw).lower()
+    if 'cled' in s: return 'Cled'
+    elif 'cetr' in s: return 'Cetr'
+    elif 'emb' in s: return 'EMB'
+    elif 'b.e.c' in s or 'bec' in s: return 'BEC'
+    return 'inne'
+
+
+def isolates(df):
+    """Cleaned 16S isolate table with normalized medium (Podloze) and genus (Rodzaj)."""
+    df = df.set_axis(df.columns.str.strip(), axis=1)
+    df = df[df[SPECIES_COLUMN].notna()]
+    df = df[~df[SPECIES_COLUMN].astype(str).str.contains('NNNNN|no significant', case=False, na=False)]
+    # Normalize the medium once per distinct value
+    codes, uniques = pd.factorize(df[MEDIUM_COLUMN])
+    media = np.array([normalize_podloze(u) for u in uniques] + [normalize_podloze(None)], dtype=object)[codes]
+    df = df.assign(Podloze=pd.Categorical(media) if compact_enabled() else media)
+    # Extract genus (once per distinct name)
+    df['Rodzaj'] = genus_column(df[SPECIES_COLUMN])
+    return df
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from microbio.tracing import traced
+
+# === Alpha diversity and rarefaction ===
+# Distinct-genera counts are not comparable between cells sampled with different
+# effort, so every cell (any combination of location, method, medium, cycle) becomes a
+# row of one sparse cells × genera abundance matrix and the indices are computed from
+# its nonzero entries with bincount: Shannon H' (natural log), Gini–Simpson 1 − Σp²
+# and bias-corrected Chao1. Rarefaction uses the closed-form hypergeometric expectation
+#   E[S_n] = Σ_i 1 − C(N − N_i, n) / C(N, n)
+# (Hurlbert 1971) evaluated with log-gamma for all nonzero entries × depths at once,
+# instead of repeated random subsampling. Isolates without an identified genus are
+# not a taxon and are left out.
+RAREFACTION_POINTS = 25
+MIN_RAREFACTION_DEPTH = 10  # smallest cell size used as the common rarefaction depth
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+class AbundanceMatrix:
+    """Sparse cells × taxa counts; ``cells`` is a frame of the cell keys in row order."""
+
+    def __init__(self, counts, cells, taxa):
+        self.counts = counts
+        self.cells = cells
+        self.taxa = taxa
+
+    @classmethod
+    def from_frame(cls, df, cell_columns, taxon_column, count_column=None):
+        """Matrix from one row per isolate (or per group with ``count_column``)."""
+        from scipy import sparse
+
+        taxa = df[taxon_column].astype(object)
+        keep = taxa.notna() & (taxa != '')
+        if count_column is not None:
+            keep &= df[count_column] > 0
+        df = df[keep.to_numpy()]
+        grouped = df.groupby(list(cell_columns), sort=True, observed=True, dropna=False)
+        cell_codes = grouped.ngroup().to_numpy()
+        cells = grouped.size().index.to_frame(index=False)
+        taxon_codes, taxa = pd.factorize(df[taxon_column].astype(object), sort=True)
+        weights = np.ones(len(df), dtype=np.int64) if count_column is None else df[count_column].to_numpy(np.int64)
+        counts = sparse.csr_matrix((weights, (cell_codes, taxon_codes)), shape=(len(cells), len(taxa)))
+        counts.sum_duplicates()
+        counts.eliminate_zeros()
+        return cls(counts, cells, pd.Index(taxa, name=taxon_column))
+
+    def _rows(self):
+        return np.repeat(np.arange(self.counts.shape[0]), np.diff(self.counts.indptr))
+
+    def sizes(self):
+        return np.bincount(self._rows(), self.counts.data, minlength=self.counts.shape[0]).astype(np.int64)
+
+    @traced('diversity.alpha', 'stats')
+    def alpha(self):
+        """N, observed S, Shannon, Simpson and Chao1 per cell, next to the cell keys."""
+        n_cells = self.counts.shape[0]
+        rows = self._rows()
+        x = self.counts.data.astype(np.float64)
+        size = np.bincount(rows, x, minlength=n_cells)
+        p = x / size[rows]
+        observed = np.diff(self.counts.indptr)
+        singletons = np.bincount(rows, x == 1, minlength=n_cells)
+        doubletons = np.bincount(rows, x == 2, minlength=n_cells)
+        out = self.cells.copy()
+        out['N'] = size.astype(np.int64)
+        out['S'] = observed
+        out['shannon'] = 0.0 - np.bincount(rows, p * np.log(p), minlength=n_cells)  # not -x: no -0.0
+        out['simpson'] = 1 - np.bincount(rows, p * p, minlength=n_cells)
+        # Bias-corrected Chao1: S + (N − 1)/N · F1(F1 − 1) / (2(F2 + 1))
+        correction = np.divide(size - 1, size, out=np.zeros(n_cells), where=size > 0)
+        out['chao1'] = observed + correction * singletons * (singletons - 1) / (2 * (doubletons + 1))
+        return out
+
+    def depths(self, points=RAREFACTION_POINTS):
+        """Shared depth grid from 1 to the largest cell size."""
+        largest = int(self.sizes().max()) if self.counts.shape[0] else 0
+        return np.unique(np.linspace(1, max(largest, 1), points).round().astype(np.int64))
+
+    @traced('diversity.rarefaction', 'stats')
+    def rarefaction(self, depths=None, max_chunk_bytes=DEFAULT_CHUNK_BYTES):
+        """Expected distinct taxa at each depth: frame of cells × depths, NaN beyond a cell's size."""
+        from scipy.special import gammaln
+
+        depths = self.depths() if depths is None else np.asarray(depths, dtype=np.int64)
+        n_cells = self.counts.shape[0]
+        rows = self._rows()
+        x = self.counts.data.astype(np.float64)
+        size = np.bincount(rows, x, minlength=n_cells)
+        rest = (size[rows] - x)[:, None]  # individuals of the other taxa, per nonzero entry
+        total = size[rows][:, None]
+        log_total = gammaln(total + 1)
+        log_rest = gammaln(rest + 1)
+
+        curves = np.empty((n_cells, len(depths)))
+        step = max(1, int(max_chunk_bytes // max(8 * len(x) * 4, 1)))
+        for start in range(0, len(depths), step):
+            n = depths[start:start + step][None, :].astype(np.float64)
+            with np.errstate(invalid='ignore'):
+                # log C(N − N_i, n) − log C(N, n); the taxon is certainly drawn when N − N_i < n
+                log_absent = (log_rest - gammaln(rest - n + 1) - log_total + gammaln(total - n + 1))
+                present = np.where(rest >= n, -np.expm1(log_absent), 1.0)
+            # Entries of a cell are contiguous (CSR): per-cell sums from one cumulative sum
+            cumulative = np.vstack([np.zeros((1, present.shape[1])), np.cumsum(present, axis=0)])
+            indptr = self.counts.indptr
+            curves[:, start:start + step] = cumulative[indptr[1:]] - cumulative[indptr[:-1]]
+        curves[size[:, None] < depths[None, :]] = np.nan
+        return pd.DataFrame(curves, index=pd.MultiIndex.from_frame(self.cells), columns=pd.Index(depths, name='depth'))
+
+    def rarefied_richness(self, depth=None, min_depth=MIN_RAREFACTION_DEPTH):
+        """(depth, expected S per cell at that common depth); cells smaller than it get NaN.
+
+        The default depth is the smallest cell size of at least ``min_depth``.
+        """
+        if depth is None:
+            sizes = self.sizes()
+            sizes = sizes[sizes >= min_depth]
+            if not len(sizes):
+                return None, pd.Series(np.nan, index=pd.MultiIndex.from_frame(self.cells))
+            depth = int(sizes.min())
+        return depth, self.rarefaction([depth]).iloc[:, 0]
+
+
+def alpha_diversity(df, cell_columns, taxon_column, count_column=None):
+    """Shannon, Simpson, Chao1 and rarefied richness for every cell of ``df``.
+
+    Returns (table, rarefaction curves, rarefaction depth).
+    """
+    matrix = AbundanceMatrix.from_frame(df, cell_columns, taxon_column, count_column)
+    table = matrix.alpha()
+    depth, rarefied = matrix.rarefied_richness()
+    table['S_rarefied'] = rarefied.to_numpy()
+    return table, matrix.rarefaction(), depth
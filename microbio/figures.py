@@ -0,0 +1,285 @@
+# === Figure builders ===
+# Each builder takes plain data and returns a figure without showing it, so the same
+# code serves interactive runs and batch export in worker processes
+# (see microbio.render).
+
+# Color map for Gram types
+GRAM_COLORS = {
+    'Gram-ujemna': '#8ecae6',  # Blue for Gram-negative
+    'Gram-dodatnia': '#888888',  # Dark gray for Gram-positive
+    'Unidentified by 16S sequencing': '#e0e0e0'  # Light gray for unidentified
+}
+
+# Fixed method colors
+METHOD_COLORS = {
+    'Sedimentation': 'steelblue',
+    'Rinse': 'forestgreen',
+    'Culture': 'gold'
+}
+
+
+# Box plots switch from every raw point to precomputed box statistics above this many rows
+BOX_POINTS_LIMIT = 5000
+BOX_SAMPLE_POINTS = 2000  # points overlaid in summary mode, over all groups
+
+
+def box_summary(values, whisker=1.5):
+    """Tukey box statistics for one group (linear quartiles, as plotly computes them)."""
+    import numpy as np
+
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return None
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    low, high = q1 - whisker * (q3 - q1), q3 + whisker * (q3 - q1)
+    inside = values[(values >= low) & (values <= high)]
+    return {
+        'n': len(values),
+        'q1': q1, 'median': median, 'q3': q3,
+        'lowerfence': inside.min(), 'upperfence': inside.max(),
+        'mean': values.mean(),
+        'outliers': values[(values < low) | (values > high)],
+    }
+
+
+def _box_sample(values, outliers, cap, rng):
+    """At most ``cap`` points of one group: the extremes, then outliers, then inliers."""
+    import numpy as np
+
+    if len(values) <= cap:
+        return values
+    # Sample positions, not values, so no point is drawn twice
+    extremes = np.unique([values.argmin(), values.argmax()])
+    is_outlier = np.isin(values, outliers)
+    rest = np.ones(len(values), dtype=bool)
+    rest[extremes] = False
+    outlier_pos = np.flatnonzero(is_outlier & rest)
+    inlier_pos = np.flatnonzero(~is_outlier & rest)
+    n_out = min(len(outlier_pos), cap // 2)
+    n_in = min(len(inlier_pos), cap - len(extremes) - n_out)
+    picked = np.concatenate([extremes, rng.choice(outlier_pos, n_out, replace=False),
+                             rng.choice(inlier_pos, n_in, replace=False)])
+    return values[picked]
+
+
+def summary_box(df, var_col, group_col, title, labels, annotation, sample_points=BOX_SAMPLE_POINTS, seed=0):
+    """Box plot from precomputed quartiles/fences plus a capped, stratified WebGL point sample.
+
+    Figure size does not grow with the number of readings: each group contributes five
+    numbers and at most ``sample_points / groups`` points (outliers first).
+    """
+    import numpy as np
+    import plotly.colors
+    import plotly.graph_objects as go
+
+    rng = np.random.default_rng(seed)
+    groups = list(df.loc[df[var_col].notna(), group_col].dropna().unique())  # groups with a box only
+    palette = plotly.colors.qualitative.Plotly
+    cap = max(sample_points // max(len(groups), 1), 3)
+    values_by_group = df.groupby(group_col, observed=True, sort=False)[var_col]
+
+    fig = go.Figure()
+    for i, group in enumerate(groups):
+        values = values_by_group.get_group(group).to_numpy(dtype=np.float64)
+        stats = box_summary(values)
+        color = palette[i % len(palette)]
+        fig.add_trace(go.Box(
+            x=[i], q1=[stats['q1']], median=[stats['median']], q3=[stats['q3']],
+            lowerfence=[stats['lowerfence']], upperfence=[stats['upperfence']], mean=[stats['mean']],
+            name=str(group), marker_color=color, boxpoints=False,
+            hovertext=f"n = {stats['n']}", width=0.5,
+        ))
+        if sample_points:
+            points = _box_sample(values[~np.isnan(values)], stats['outliers'], cap, rng)
+            fig.add_trace(go.Scattergl(
+                x=i - 0.45 + rng.uniform(-0.1, 0.1, len(points)), y=points,
+                mode='markers', marker=dict(color=color, size=4, opacity=0.5),
+                name=f"{group} (sample of {len(points)} / {stats['n']})", hoverinfo='y',
+            ))
+
+    fig.update_layout(
+        title=title, title_x=0.5, showlegend=False,
+        xaxis=dict(tickvals=list(range(len(groups))), ticktext=[str(g) for g in groups],
+                   title=labels.get(group_col, group_col)),
+        yaxis=dict(title=labels.get(var_col, var_col)),
+    )
+    fig.add_annotation(
+        text=annotation,
+        xref="paper", yref="paper",
+        x=0.5, y=1.08, showarrow=False,
+        font=dict(size=14)
+    )
+    return fig
+
+
+def group_box(df, var_col, group_col, title, labels, annotation, points='auto'):
+    """Box plot per group with a test-result annotation.
+
+    ``points``: 'all' draws every data point (px.box), 'summary' precomputed box
+    statistics with a point sample (``summary_box``), 'auto' picks 'summary' above
+    BOX_POINTS_LIMIT rows.
+    """
+    import plotly.express as px
+
+    if points == 'summary' or (points == 'auto' and df[var_col].count() > BOX_POINTS_LIMIT):
+        return summary_box(df, var_col, group_col, title, labels, annotation)
+
+    fig = px.box(
+        df,
+        x=group_col,
+        y=var_col,
+        points="all",
+        color=group_col,
+        title=title,
+        labels=labels
+    )
+
+    fig.update_layout(title_x=0.5, showlegend=False)
+    fig.add_annotation(
+        text=annotation,
+        xref="paper", yref="paper",
+        x=0.5, y=1.08, showarrow=False,
+        font=dict(size=14)
+    )
+    return fig
+
+
+def location_method_bars(df_melted):
+    """Grouped bars of per-localization averages (values already scaled to ×10²)."""
+    import plotly.express as px
+
+    fig = px.bar(
+        df_melted,
+        x="lokalizacja",
+        y="Wartosc_scaled",
+        color="Method",
+        barmode="group",
+        text="label",
+        title="Average bacterial amount per localization (scaled to ×10²)"
+    )
+
+    fig.update_layout(
+        yaxis_title="DNA amount (×10² / m³)",
+        xaxis_title="Localization",
+        title_x=0.5,
+        bargap=0.3
+    )
+
+    fig.update_traces(textposition='outside')
+    return fig
+
+
+def grouped_bar(df, value_column, title, ylabel, locations, method_list):
+    """Matplotlib bars per location with one bar per sampling method."""
+    import numpy as np
+    import matplotlib.pyplot as plt
+
+    x = np.arange(len(locations))  # base x positions
+    width = 0.25
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    for i, method in enumerate(method_list):
+        values = df[df['Method'] == method][value_column].values
+        ax.bar(x + i * width, values, width, label=method, color=METHOD_COLORS[method])
+
+    ax.set_xticks(x + width)
+    ax.set_xticklabels(locations, rotation=45)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.legend(title='Sampling method')
+    fig.tight_layout()
+    return fig
+
+
+def medium_donut(data, medium):
+    """Donut of genera on one medium; ``data`` has Rodzaj, count and percent."""
+    import plotly.express as px
+
+    # Create figure using Rodzaj as name (to keep clean legend)
+    fig = px.pie(
+        data,
+        names='Rodzaj',
+        values='count',
+        title=f"Bacteria on medium: {medium}",
+        hole=0.3
+    )
+
+    # Display with 2 decimal places in both the text and hovertemplate
+    fig.update_traces(
+        text=data['percent'].map(lambda x: f"{x:.2f}%"),
+        textposition='inside',
+        hovertemplate='%{label} (%{percent:.2f}%)<extra></extra>',
+        textinfo='text'  # Only show custom text, not default label
+    )
+
+    # Keep the legend readable (Rodzaj only)
+    fig.update_layout(
+        margin=dict(t=50, b=0, l=0, r=0),
+        showlegend=True
+    )
+    return fig
+
+
+def cycle_sunburst(counts, cycle):
+    """Localization → medium → genus sunburst for one sampling cycle, colored by Gram type."""
+    import plotly.express as px
+
+    # Build sunburst chart with localization and podloze layers
+    fig = px.sunburst(
+        counts,
+        path=['Localization', 'Podloze', 'Rodzaj_label'],
+        values='count',
+        color='Typ Grama',
+        color_discrete_map=GRAM_COLORS,
+        title=f'Sunburst – Bacteria, Medium and Localisation (Cycle {cycle})'
+    )
+
+    # Set a uniform gray for localization and podloze
+    fig.update_traces(marker=dict(colorscale=[[0, '#d3d3d3']]))
+
+    fig.update_layout(margin=dict(t=50, l=0, r=0, b=0))
+    return fig
+
+
+def rarefaction_curves(curves, title):
+    """Expected distinct genera vs. isolates drawn, one line per cell (row of ``curves``)."""
+    import numpy as np
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    depths = np.asarray(curves.columns, dtype=float)
+    for keys, values in zip(curves.index, curves.to_numpy()):
+        label = ' / '.join(str(k) for k in (keys if isinstance(keys, tuple) else (keys,)))
+        observed = ~np.isnan(values)
+        fig.add_trace(go.Scatter(x=depths[observed], y=values[observed], mode='lines', name=label))
+
+    fig.update_layout(
+        title=title,
+        title_x=0.5,
+        xaxis_title="Isolates drawn",
+        yaxis_title="Expected distinct genera",
+    )
+    return fig
+
+
+def concordance_heatmap(matrix, title):
+    """Method × method heatmap of a concordance coefficient (e.g. Lin's CCC), values printed."""
+    import numpy as np
+    import plotly.graph_objects as go
+
+    values = matrix.to_numpy(dtype=float)
+    fig = go.Figure(go.Heatmap(
+        z=values,
+        x=list(matrix.columns),
+        y=list(matrix.index),
+        zmin=-1,
+        zmax=1,
+        colorscale='RdBu',
+        text=np.where(np.isnan(values), '', np.round(values, 2).astype(str)),
+        texttemplate='%{text}',
+        hovertemplate='%{y} vs %{x}: %{z:.3f}<extra></extra>',
+    ))
+    fig.update_layout(title=title, title_x=0.5, yaxis_autorange='reversed')
+    return fig
@@ -0,0 +1,96 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from microbio.tracing import traced
+
+# === Named genus groups (coliforms, Pseudomonas, ...) ===
+# Group membership is decided once per distinct taxon name with a single Aho–Corasick
+# pass over all groups' keywords (case-insensitive substring match, like the old
+# str.contains filters), then broadcast to rows through factorize codes. Counts and
+# distinct-taxa diversity for every group × location × method come from one groupby.
+
+
+class KeywordMatcher:
+    """Aho–Corasick automaton mapping keywords to the groups that contain them."""
+
+    def __init__(self, groups):
+        self.group_names = list(groups)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [set()]
+        for g, keywords in enumerate(groups.values()):
+            for keyword in keywords:
+                self._add(keyword.lower(), g)
+        self._link()
+
+    def _add(self, keyword, group):
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            node = nxt
+        self._out[node].add(group)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def groups_in(self, text):
+        """Indices of every group with at least one keyword occurring in ``text``."""
+        found = set()
+        node = 0
+        for ch in text.lower():
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            found |= self._out[node]
+        return found
+
+
+def group_membership(names, groups):
+    """Boolean frame (rows × groups): does the row's taxon name belong to each group?"""
+    matcher = KeywordMatcher(groups)
+    codes, uniques = pd.factorize(pd.Series(names, copy=False))
+    per_unique = np.zeros((len(uniques) + 1, len(groups)), dtype=bool)  # last row: missing names
+    for i, name in enumerate(uniques):
+        per_unique[i, list(matcher.groups_in(str(name)))] = True
+    return pd.DataFrame(per_unique[codes], columns=matcher.group_names, index=getattr(names, 'index', None))
+
+
+@traced('group_cube', 'aggregate')
+def group_cube(df, groups, taxon_col, location_col, method_col, locations, methods):
+    """Isolate count and distinct taxa for every group × location × method, zero-filled.
+
+    Returns columns Group, Location, Method, Sample_count, Diversity, ordered by
+    group, then ``locations``, then ``methods``.
+    """
+    membership = group_membership(df[taxon_col], groups).to_numpy()
+    rows, group_idx = np.nonzero(membership)
+
+    long = pd.DataFrame({
+        'Group': np.asarray(list(groups), dtype=object)[group_idx],
+        'Location': df[location_col].to_numpy()[rows],
+        'Method': df[method_col].to_numpy()[rows],
+        'taxon': pd.factorize(df[taxon_col])[0][rows],
+    })
+    cube = long.groupby(['Group', 'Location', 'Method'], sort=False).agg(
+        Sample_count=('taxon', 'size'),
+        Diversity=('taxon', 'nunique')
+    )
+    combinations = pd.MultiIndex.from_product([list(groups), locations, methods], names=['Group', 'Location', 'Method'])
+    return cube.reindex(combinations, fill_value=0).reset_index()
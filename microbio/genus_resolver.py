@@ -0,0 +1,195 @@
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+from microbio.tracing import traced
+
+# === Fuzzy genus resolution ===
+# Genus names extracted from the 16S tables are matched against a reference list (the
+# Gram registry's genera, plus the one-name-per-line file in MICROBIO_GENUS_REFERENCE).
+# Case slips always resolve to the reference spelling. Fuzzy matching is opt-in: with
+# MICROBIO_GENUS_MAX_DISTANCE=1 (or 2) misspellings ('Pseudomonass', 'Bacilus') resolve
+# to the closest reference genus within that edit distance (names shorter than 4 × the
+# distance get less leeway). It is only as safe as the reference is broad: a real genus
+# missing from it ('Shinella') is rewritten to a neighbour ('Shigella'), so point
+# MICROBIO_GENUS_REFERENCE at a full genus list before enabling it. The reference is
+# indexed in a BK-tree, so a lookup prunes the candidates with the triangle inequality
+# instead of comparing against every genus, and only distinct names that are not
+# already exact are looked up, each once per process. Every rewrite is kept with its
+# distance (``GenusResolver.audit``) and printed as a table.
+DEFAULT_MAX_DISTANCE = 0
+RESOLVER_VERSION = 1  # bump when the matching rules change (invalidates the aggregate store)
+
+
+def _bitmasks(pattern):
+    peq = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    return peq
+
+
+def _distance(peq, m, text):
+    """Edit distance from the ``m``-long pattern behind ``peq`` to ``text`` (Myers' bit-parallel)."""
+    if not m:
+        return len(text)
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for ch in text:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = (ph << 1) | 1
+        pv = ((mh << 1) | ~(xv | ph)) & mask
+        mv = ph & xv & mask
+    return score
+
+
+def levenshtein(a, b):
+    """Edit distance (insert, delete, substitute) between two strings."""
+    return _distance(_bitmasks(a), len(a), b)
+
+
+class BKTree:
+    """Burkhard–Keller tree over the edit distance."""
+
+    def __init__(self, words=()):
+        self.root = None
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        if self.root is None:
+            self.root = (word, {})
+            self.size = 1
+            return
+        peq, m = _bitmasks(word), len(word)
+        node = self.root
+        while True:
+            d = _distance(peq, m, node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = (word, {})
+                self.size += 1
+                return
+            node = child
+
+    def search(self, word, max_distance):
+        """(distance, word) for every indexed word within ``max_distance``, closest first."""
+        if self.root is None:
+            return []
+        peq, m = _bitmasks(word), len(word)  # the query is the pattern for every comparison
+        found, stack = [], [self.root]
+        while stack:
+            node_word, children = stack.pop()
+            d = _distance(peq, m, node_word)
+            if d <= max_distance:
+                found.append((d, node_word))
+            for edge, child in children.items():
+                if d - max_distance <= edge <= d + max_distance:
+                    stack.append(child)
+        return sorted(found)
+
+
+class GenusResolver:
+    def __init__(self, reference, max_distance=DEFAULT_MAX_DISTANCE):
+        self.canonical = {}  # lowercased -> reference spelling
+        for genus in reference:
+            genus = str(genus).strip()
+            if genus:
+                self.canonical.setdefault(genus.lower(), genus)
+        self.max_distance = max_distance
+        self._tree = None
+        self._cache = {}  # name -> (match or None, distance)
+        self._reported = set()
+
+    @property
+    def tree(self):
+        if self._tree is None:  # built on the first name that needs it
+            self._tree = BKTree(sorted(self.canonical))
+        return self._tree
+
+    def allowed_distance(self, name):
+        return min(self.max_distance, len(name) // 4)
+
+    def lookup(self, name):
+        """(reference genus or None, edit distance) for one name, cached."""
+        hit = self._cache.get(name)
+        if hit is not None:
+            return hit
+        key = name.strip().lower()
+        if key in self.canonical:
+            hit = (self.canonical[key], 0)
+        else:
+            limit = self.allowed_distance(key)
+            candidates = self.tree.search(key, limit) if limit > 0 else []
+            hit = (self.canonical[candidates[0][1]], candidates[0][0]) if candidates else (None, None)
+        self._cache[name] = hit
+        return hit
+
+    def cache_clear(self):
+        """Forget every looked-up name (the reference and its BK-tree are kept)."""
+        self._cache.clear()
+
+    @traced('genus_resolver.resolve', 'taxonomy')
+    def resolve(self, names):
+        """Reference spelling for every name that resolves; others are returned unchanged."""
+        out = []
+        for name in names:
+            match = self.lookup(name)[0] if name else None
+            out.append(match if match is not None else name)
+        return out
+
+    def audit(self):
+        """Every name looked up that was not already spelled as in the reference."""
+        rows = [(name, match, distance) for name, (match, distance) in self._cache.items()
+                if match != name]
+        return pd.DataFrame(rows, columns=['name', 'match', 'distance'])
+
+    def report_corrections(self):
+        """Print every rewrite (name → reference spelling) not reported yet, as a table."""
+        rewrites = self.audit().dropna(subset=['match'])
+        rewrites = rewrites[~rewrites['name'].isin(self._reported)].sort_values(['distance', 'name'])
+        if len(rewrites):
+            rewrites = rewrites.astype({'distance': int}).rename(columns={'name': 'old name', 'match': 'new name'})
+            print(f"🔤 {len(rewrites)} genus name(s) rewritten to the reference spelling:\n"
+                  + rewrites.to_string(index=False) + "\n")
+            self._reported |= set(rewrites['old name'])
+
+
+def _read_reference(path):
+    with open(path, encoding='utf-8') as fh:
+        return [line.strip() for line in fh if line.strip() and not line.startswith('#')]
+
+
+@lru_cache(maxsize=None)
+def _load(reference_path, max_distance):
+    from microbio.gram import load_gram_registry
+
+    reference = [genus.capitalize() for genus in load_gram_registry().by_genus]  # stored lowercased
+    if reference_path:
+        reference = _read_reference(reference_path) + reference  # the file's spelling wins
+    return GenusResolver(reference, max_distance)
+
+
+def resolver_settings(reference_path=None, max_distance=None):
+    """(absolute reference path or None, max distance) from the arguments or the environment."""
+    reference_path = reference_path or os.environ.get('MICROBIO_GENUS_REFERENCE')
+    if max_distance is None:
+        max_distance = int(os.environ.get('MICROBIO_GENUS_MAX_DISTANCE', DEFAULT_MAX_DISTANCE))
+    return (os.path.abspath(reference_path) if reference_path else None), max_distance
+
+
+def load_genus_resolver(reference_path=None, max_distance=None):
+    """Resolver over the Gram registry genera and MICROBIO_GENUS_REFERENCE (built once)."""
+    return _load(*resolver_settings(reference_path, max_distance))
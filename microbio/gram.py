@@ -0,0 +1,70 @@
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from microbio.tracing import traced
+
+# === Gram-stain registry ===
+# Curated genus -> Gram type table kept in a versioned JSON file so genera can be
+# added without touching code. MICROBIO_GRAM_REGISTRY points at an alternative file.
+DEFAULT_REGISTRY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'gram_registry.json')
+
+
+class GramRegistry:
+    def __init__(self, by_genus, labels, version=None):
+        self.by_genus = by_genus  # lowercased genus -> label
+        self.labels = labels
+        self.version = version
+        self.unidentified = labels['unidentified']
+        self.categories = [labels['negative'], labels['positive'], self.unidentified]
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding='utf-8') as fh:
+            doc = json.load(fh)
+        labels = doc['labels']
+        by_genus = {}
+        for kind, genera in doc['genera'].items():
+            for genus in genera:
+                key = genus.strip().lower()
+                if by_genus.get(key, labels[kind]) != labels[kind]:
+                    raise ValueError(f"{path}: genus '{genus}' is listed as more than one Gram type")
+                by_genus[key] = labels[kind]
+        return cls(by_genus, labels, doc.get('version'))
+
+    def __contains__(self, genus):
+        return str(genus).lower() in self.by_genus
+
+    def __len__(self):
+        return len(self.by_genus)
+
+    @traced('gram.classify', 'taxonomy')
+    def classify(self, genus):
+        """Gram type for every row of a genus column, as a Categorical.
+
+        The lookup runs once per distinct genus; rows only carry integer codes.
+        """
+        genus = pd.Series(genus, copy=False).astype('category')
+        per_category = genus.cat.categories.astype(str).str.lower().map(self.by_genus)
+        per_category = pd.Categorical(per_category, categories=self.categories).fillna(self.unidentified)
+        # Trailing slot catches missing genera (code -1)
+        lookup = np.append(per_category.codes, self.categories.index(self.unidentified))
+        return pd.Categorical.from_codes(lookup[genus.cat.codes.to_numpy()], categories=self.categories)
+
+
+@lru_cache(maxsize=None)
+def _load(path):
+    return GramRegistry.from_file(path)
+
+
+def load_gram_registry(path=None):
+    """Registry from ``path``, MICROBIO_GRAM_REGISTRY or the bundled data file (loaded once)."""
+    return _load(registry_path(path))
+
+
+def registry_path(path=None):
+    """Absolute path of the registry file in use: ``path``, MICROBIO_GRAM_REGISTRY or the bundled one."""
+    return os.path.abspath(path or os.environ.get('MICROBIO_GRAM_REGISTRY') or DEFAULT_REGISTRY)
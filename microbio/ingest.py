@@ -0,0 +1,163 @@
+import glob
+import os
+
+import pandas as pd
+
+from microbio.compact import compact_enabled, compact_frame, memory_report
+from microbio.tracing import span
+from microbio.workbooks import CACHE_DIR_NAME, SchemaError, project_columns, read_header, read_sheet
+
+# === Multi-workbook campaign ingestion ===
+# Labs deliver one workbook per campaign and site. ``ingest`` takes a directory (searched
+# recursively) or a glob, reads the workbooks in a process pool and returns the same
+# {key: frame} mapping as ``load_inputs``, so every analysis runs unchanged over them:
+#   microbio --inputs 'campaigns/' sunburst
+# A workbook provides an input when it has the input's sheet and that sheet has all of
+# the input's schema columns (datasets.SHEET_SCHEMAS); the sheet name alone is not
+# enough, because several lab workbooks name their only sheet 'Arkusz1'. Each worker
+# checks the candidate sheets' header rows and reads only the schema columns of the
+# matching ones (through the columnar cache). Rows are tagged with source_file and campaign (the first directory
+# below the root, or the file name for flat directories). Failed files are reported
+# and skipped, not fatal.
+SOURCE_COLUMN = 'source_file'
+CAMPAIGN_COLUMN = 'campaign'
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xlsm')
+
+
+def find_workbooks(pattern):
+    """(root, sorted workbook paths) for a directory or a glob pattern."""
+    if os.path.isdir(pattern):
+        root = pattern
+        paths = glob.glob(os.path.join(glob.escape(pattern), '**', '*'), recursive=True)
+    else:
+        paths = glob.glob(pattern, recursive=True)
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths]) if paths else '.'
+    paths = [p for p in paths
+             if p.lower().endswith(WORKBOOK_EXTENSIONS)
+             and not os.path.basename(p).startswith('~$')  # Excel lock files
+             and CACHE_DIR_NAME not in p.split(os.sep)]
+    return root, sorted(paths)
+
+
+def campaign_of(path, root):
+    relative = os.path.relpath(os.path.abspath(path), os.path.abspath(root))
+    parts = relative.split(os.sep)
+    return parts[0] if len(parts) > 1 else os.path.splitext(parts[0])[0]
+
+
+def _sheet_names(path):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def read_workbook(path, wanted):
+    """Worker: {key: frame} for the inputs this workbook provides.
+
+    ``wanted`` maps key -> (sheet, schema columns). Candidate sheets are matched on
+    their header row and only then read, as just the schema columns. Returns
+    (frames, notes), where notes explain near misses: sheets with at least half of an
+    input's columns.
+    """
+    frames, notes = {}, []
+    sheets = set(_sheet_names(path))
+    by_sheet = {}
+    for key, (sheet, columns) in wanted.items():
+        if sheet in sheets:
+            by_sheet.setdefault(sheet, []).append((key, columns))
+    for sheet, candidates in by_sheet.items():
+        header = read_header(path, sheet)
+        stripped = {str(col).strip() for col in header}
+        matched = [(key, columns) for key, columns in candidates if all(col in stripped for col in columns)]
+        if matched:
+            needed = list(dict.fromkeys(col for _, columns in matched for col in columns))
+            df = read_sheet(path, sheet, needed)
+            by_name = {str(col).strip(): col for col in df.columns}
+            for key, columns in matched:
+                frames[key] = df[[by_name[col] for col in columns]].set_axis(list(columns), axis=1)
+        else:
+            best = min(candidates, key=lambda c: sum(col not in stripped for col in c[1]))
+            missing = [col for col in best[1] if col not in stripped]
+            if len(missing) <= len(best[1]) / 2:  # probably meant as this input (renamed column?)
+                try:
+                    project_columns(header, best[1], f"sheet '{sheet}'")
+                except SchemaError as exc:
+                    notes.append(str(exc))
+    return frames, notes
+
+
+def _read_one(path, wanted):
+    try:
+        frames, notes = read_workbook(path, wanted)
+        return path, frames, notes, None
+    except Exception as exc:
+        return path, {}, [], f"{type(exc).__name__}: {' '.join(str(exc).split())}"
+
+
+def ingest(inputs, pattern, workers=None):
+    """Read every workbook under ``pattern`` and concatenate the frames for ``inputs``.
+
+    ``inputs`` is an analysis' INPUTS mapping ({key: (workbook, sheet)}); the workbook
+    name is ignored, the sheet and its schema decide. Raises FileNotFoundError when no
+    workbook provides one of the inputs.
+    """
+    from microbio.datasets import SHEET_SCHEMAS
+
+    root, paths = find_workbooks(pattern)
+    if not paths:
+        raise FileNotFoundError(f"No workbooks found for {pattern!r}")
+    wanted = {key: (sheet, list(SHEET_SCHEMAS[(workbook, sheet)])) for key, (workbook, sheet) in inputs.items()}
+
+    with span('ingest', 'load', files=len(paths)):
+        if workers == 1 or len(paths) == 1:
+            results = [_read_one(path, wanted) for path in paths]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(paths))) as pool:
+                results = list(pool.map(_read_one, paths, [wanted] * len(paths)))
+
+    parts = {key: [] for key in inputs}
+    failed, near_misses, unused = [], [], 0
+    for path, frames, notes, error in results:
+        source = os.path.relpath(path, root)
+        if error:
+            failed.append((source, error))
+            continue
+        near_misses += [(source, note) for note in notes]
+        if not frames:
+            unused += 1
+            continue
+        for key, frame in frames.items():
+            parts[key].append(frame.assign(**{SOURCE_COLUMN: source, CAMPAIGN_COLUMN: campaign_of(path, root)}))
+
+    print(f"📥 Ingested {len(paths) - len(failed) - unused} of {len(paths)} workbook(s) from {pattern}"
+          + (f" ({unused} without the sheets this analysis reads)" if unused else ""))
+    for source, note in near_misses:
+        print(f"⚠️ {source}: {note}")
+    if failed:
+        print(f"⚠️ {len(failed)} workbook(s) could not be read:")
+        for source, error in failed:
+            print(f"   {source}: {error}")
+
+    missing = [key for key, frames in parts.items() if not frames]
+    if missing:
+        raise FileNotFoundError(f"No workbook under {pattern!r} provides: "
+                                + ', '.join(f"{key} ({inputs[key][1]})" for key in missing))
+
+    out = {}
+    for key, frames in parts.items():
+        combined = pd.concat(frames, ignore_index=True)
+        combined[SOURCE_COLUMN] = combined[SOURCE_COLUMN].astype('category')
+        combined[CAMPAIGN_COLUMN] = combined[CAMPAIGN_COLUMN].astype('category')
+        if compact_enabled():
+            schema = {**SHEET_SCHEMAS[inputs[key]], SOURCE_COLUMN: 'category', CAMPAIGN_COLUMN: 'category'}
+            compacted = compact_frame(combined, schema)
+            memory_report(f"{key} ({len(frames)} workbook(s))", combined, compacted)
+            combined = compacted
+        out[key] = combined
+    return out
@@ -0,0 +1,143 @@
+import json
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from microbio.tracing import traced
+
+# === Canonical sampling locations ===
+# Raw labels from every sheet are resolved to one registry entry (integer id, canonical
+# code, control flag, site type) by exact, case- and whitespace-insensitive match on the
+# code, name or aliases. Frames carry the code as a Categorical, so merges run on integer
+# codes and group flags are array lookups. Labels that do not resolve stay their own
+# site, so no rows are lost and the per-location groups match the raw labels. They are
+# kept in a per-registry fallback table, never added to the registered entries (the
+# shared ``dtype`` stays fixed for the whole run), and listed by ``unresolved`` for the
+# curators. An entry's 'contains' fragments only carry its control flag and site type
+# over to such labels (e.g. 'WPN 2' is its own site in the control group).
+# MICROBIO_LOCATION_REGISTRY points at an alternative registry file.
+DEFAULT_REGISTRY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'locations.json')
+
+CONTROL_GROUP = 'WPN (control)'
+OTHER_GROUP = 'Other locations'
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_label(label):
+    return _WHITESPACE.sub(' ', str(label)).strip().casefold()
+
+
+class LocationRegistry:
+    def __init__(self, entries, version=None):
+        self.version = version
+        self.entries = pd.DataFrame(entries, columns=['id', 'code', 'name', 'control', 'site_type']).astype(
+            {'id': np.int64, 'control': bool})
+        self.entries['registered'] = True
+        self._by_key = {}
+        self._contains = []
+        for entry in entries:
+            for alias in [entry['code'], entry.get('name', '')] + list(entry.get('aliases', [])):
+                if alias:
+                    self._by_key[normalize_label(alias)] = entry['code']
+            for fragment in entry.get('contains', []):
+                self._contains.append((normalize_label(fragment), entry))
+        self._fallback = {}  # normalized unresolved label -> ad-hoc entry row
+        self._table = None
+        self.unresolved = set()
+        self._reported = set()
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding='utf-8') as fh:
+            doc = json.load(fh)
+        return cls(doc['locations'], doc.get('version'))
+
+    @property
+    def dtype(self):
+        """Shared CategoricalDtype of the registered codes, in id order (fixed for the run)."""
+        return pd.CategoricalDtype(self.entries['code'].tolist())
+
+    @property
+    def table(self):
+        """Registered entries followed by the ad-hoc ones seen so far, indexed by code."""
+        if self._table is None:
+            adhoc = pd.DataFrame(list(self._fallback.values()), columns=self.entries.columns)
+            self._table = pd.concat([self.entries, adhoc], ignore_index=True).set_index('code', drop=False)
+        return self._table
+
+    def _lookup(self, label):
+        key = normalize_label(label)
+        code = self._by_key.get(key)
+        if code is not None:
+            return code
+        if key not in self._fallback:
+            # Keep the rows: the label becomes its own ad-hoc site, outside the registry
+            code = _WHITESPACE.sub(' ', str(label)).strip()
+            rule = next((entry for fragment, entry in self._contains if fragment in key), None)
+            next_id = int(self.entries['id'].max()) + 1 + len(self._fallback) if len(self.entries) else 1
+            self._fallback[key] = [next_id, code, code, bool(rule and rule.get('control', False)),
+                                   rule['site_type'] if rule else 'unregistered', False]
+            self._table = None
+        self.unresolved.add(str(label))
+        return self._fallback[key][1]
+
+    @traced('locations.resolve', 'parse')
+    def resolve(self, labels):
+        """Canonical location Categorical for a column of raw labels.
+
+        Categories are the registered codes (``dtype``), followed by any ad-hoc labels
+        seen so far.
+        """
+        codes, uniques = pd.factorize(pd.Series(labels, copy=False))
+        resolved = [self._lookup(u) for u in uniques]
+        categories = self.table.index if self._fallback else self.dtype.categories
+        per_unique = np.append(categories.get_indexer(resolved), -1)  # missing label -> NaN
+        return pd.Categorical.from_codes(per_unique[codes], categories=categories)
+
+    def _per_location(self, locations, column, missing):
+        locations = pd.Categorical(locations)
+        values = self.table[column].reindex(locations.categories.astype(object), fill_value=missing).to_numpy()
+        return np.append(values, missing)[locations.codes]
+
+    def ids(self, locations):
+        """Integer location ids for a resolved Categorical (-1 for missing)."""
+        return self._per_location(locations, 'id', -1).astype(np.int64)
+
+    def from_ids(self, ids):
+        """Resolved Categorical back from integer ids (-1 -> missing)."""
+        table = self.table
+        position = pd.Index(table['id']).get_indexer(np.asarray(ids))
+        return pd.Categorical.from_codes(position, categories=table.index)
+
+    def is_control(self, locations):
+        return self._per_location(locations, 'control', False).astype(bool)
+
+    def group(self, locations):
+        """'WPN (control)' / 'Other locations' per row, as a vectorized lookup."""
+        return np.where(self.is_control(locations), CONTROL_GROUP, OTHER_GROUP)
+
+    def report_unresolved(self):
+        """Print labels that did not resolve (each one once)."""
+        new = self.unresolved - self._reported
+        if new:
+            print(f"⚠️ {len(new)} location label(s) not in the registry:", sorted(new))
+            self._reported |= new
+
+
+@lru_cache(maxsize=None)
+def _load(path):
+    return LocationRegistry.from_file(path)
+
+
+def load_location_registry(path=None):
+    """Registry from ``path``, MICROBIO_LOCATION_REGISTRY or the bundled data file (loaded once)."""
+    return _load(registry_path(path))
+
+
+def registry_path(path=None):
+    """Absolute path of the registry file in use: ``path``, MICROBIO_LOCATION_REGISTRY or the bundled one."""
+    return os.path.abspath(path or os.environ.get('MICROBIO_LOCATION_REGISTRY') or DEFAULT_REGISTRY)
@@ -0,0 +1,65 @@
+import re
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from microbio.tracing import traced
+
+# === Scientific notation as typed in the lab sheets ===
+# Matches e.g. "3,6×10^2", "3.6x10**-2", "3.6 x 10 2" (after ',' -> '.' normalisation).
+# Like the old per-cell parser only the start of the cell is anchored, so trailing
+# units ("3,6×10^2 CFU") are ignored.
+SCIENTIFIC_PATTERN = re.compile(r'^\s*([+-]?[\d.]+)\s*[xX×]\s*10\s*(?:\^|\*\*|\*)?\s*([+-]?\d+)')
+
+
+class ParsedColumn(NamedTuple):
+    values: np.ndarray      # float64, aligned with the input
+    rejected: pd.Series     # raw non-blank cells that could not be parsed (original index)
+
+
+@traced('parse_scientific', 'parse')
+def parse_scientific(column):
+    """Parse a whole column of counts written as 3,6×10^2, 3.6x10**-2, 360 or blank.
+
+    Blanks become NaN silently; anything else that cannot be read becomes NaN and is
+    listed in ``rejected`` so it can be reported instead of disappearing.
+    """
+    s = pd.Series(column, copy=False)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        # Compact frames: parse each distinct cell text once, broadcast through the codes
+        categories = parse_scientific(pd.Series(s.cat.categories.astype(object)))
+        codes = s.cat.codes.to_numpy()
+        values = np.append(categories.values, np.nan)[codes]
+        return ParsedColumn(values, s[np.isin(codes, categories.rejected.index.to_numpy())])
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        return ParsedColumn(s.to_numpy(dtype=np.float64, na_value=np.nan), s.iloc[:0])
+
+    text = s.astype(object).where(s.notna()).astype('string').str.strip()
+    blank = text.isna() | (text == '')
+    text = text.str.replace(',', '.', regex=False)
+
+    out = np.full(len(s), np.nan, dtype=np.float64)
+
+    parts = text.str.extract(SCIENTIFIC_PATTERN)
+    is_sci = parts[0].notna().to_numpy()
+    if is_sci.any():
+        mantissa = pd.to_numeric(parts[0][is_sci], errors='coerce').to_numpy(dtype=np.float64)
+        exponent = pd.to_numeric(parts[1][is_sci], errors='coerce').to_numpy(dtype=np.float64)
+        out[is_sci] = mantissa * np.power(10.0, exponent)
+
+    plain = ~is_sci & ~blank.to_numpy()
+    if plain.any():
+        out[plain] = pd.to_numeric(text[plain], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+    rejected = np.isnan(out) & ~blank.to_numpy()
+    # Cells that literally say "nan" are blanks too, not parse failures
+    rejected &= ~text.str.lower().isin(['nan', 'none']).fillna(False).to_numpy()
+    return ParsedColumn(out, s[rejected])
+
+
+def report_rejected(parsed, column_name):
+    """Print the cells ``parse_scientific`` could not read, if any."""
+    if len(parsed.rejected):
+        print(f"⚠️ {column_name}: {len(parsed.rejected)} unparsed value(s):",
+              parsed.rejected.astype(str).unique().tolist())
@@ -0,0 +1,292 @@
+import difflib
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from microbio import datasets
+from microbio.tracing import span, traced
+
+# === Indexed in-memory queries ===
+# Ad-hoc questions ("Pseudomonas isolates at KG on EMB in cycle III", "mean regA at WPN")
+# against tables built once from the loaded workbooks. Every key label is an integer
+# code in its level's order (cycles I, II, ..., X in numeric order, everything else by
+# name), and:
+#   * totals: for every subset of the keys, the aggregated rows are encoded as one sorted
+#     mixed-radix int64 key with prefix sums of the values, so a total is a binary search
+#     per selected key combination (a range on the last selected key is one contiguous
+#     block) and never touches the rows
+#   * rows: per key, the row positions sorted by code (a posting list per label), so the
+#     matching rows are the intersection of a few slices, not a full-frame boolean mask
+# Criteria are a label, a list of labels or an inclusive label slice, e.g.
+#   q = open_query(data_dir)
+#   q.isolates.count(genus='Pseudomonas', location='KG', medium='EMB', cycle='III')
+#   q.measurements.mean(location='WPN', method='regA')
+#   q.isolates.breakdown('genus', cycle=slice('II', 'IV'))
+TABLE_INPUTS = {
+    'isolates': {'isolates': (datasets.ISOLATE_WORKBOOK, datasets.ISOLATE_SHEET)},
+    'gram_negative': {'gram_negative': (datasets.CULTURE_WORKBOOK, datasets.GRAM_NEGATIVE_SHEET)},
+    'measurements': {'culture': (datasets.CULTURE_WORKBOOK, datasets.CULTURE_SHEET),
+                     'pcr': (datasets.PCR_WORKBOOK, datasets.PCR_SHEET)},
+}
+ISOLATE_KEYS = ['cycle', 'location', 'medium', 'genus', 'gram']
+GRAM_NEGATIVE_KEYS = ['location', 'method', 'genus']
+MEASUREMENT_KEYS = ['source', 'location', 'method']
+
+
+def _runs(codes):
+    """Sorted distinct codes as inclusive (start, stop) runs of consecutive codes."""
+    breaks = np.flatnonzero(np.diff(codes) != 1) + 1
+    return codes[np.r_[0, breaks]], codes[np.r_[breaks - 1, len(codes) - 1]]
+
+
+class FactIndex:
+    """Aggregated rows over ``keys`` with per-subset prefix-sum totals and per-key posting lists."""
+
+    def __init__(self, frame, keys, values, orders=None):
+        orders = orders or {}
+        self.keys = list(keys)
+        self.values = list(values)
+        self.levels = {key: pd.Index(sorted(frame[key].unique(), key=orders.get(key)), dtype=object)
+                       for key in self.keys}
+        self.sizes = np.array([len(self.levels[key]) for key in self.keys], dtype=np.int64)
+        # Label -> code per key: exact labels, their text, then case-insensitive text
+        self._label_codes = {}
+        for key, level in self.levels.items():
+            lookup = {}
+            for code, label in reversed(list(enumerate(level))):
+                lookup[str(label).casefold()] = code
+            for code, label in enumerate(level):
+                lookup[str(label)] = code
+                lookup[label] = code
+            self._label_codes[key] = lookup
+
+        # Collapse duplicate key combinations, rows sorted by the full key
+        codes = np.column_stack([self.levels[key].get_indexer(frame[key]) for key in self.keys])
+        full, inverse = np.unique(self._encode(codes, range(len(self.keys))), return_inverse=True)
+        sums = np.column_stack([np.bincount(inverse, frame[v].to_numpy(np.float64), minlength=len(full))
+                                for v in self.values])
+        self._codes = np.column_stack(np.unravel_index(full, self.sizes)) if len(full) else codes[:0]
+        self._sums = sums
+        self.frame = pd.DataFrame({key: pd.Categorical.from_codes(self._codes[:, i], categories=self.levels[key],
+                                                                  ordered=True)
+                                   for i, key in enumerate(self.keys)})
+        for i, v in enumerate(self.values):
+            self.frame[v] = sums[:, i].astype(frame[v].dtype)
+
+        self._postings = []
+        for i in range(len(self.keys)):
+            order = np.argsort(self._codes[:, i], kind='stable')
+            bounds = np.r_[0, np.cumsum(np.bincount(self._codes[:, i], minlength=self.sizes[i]))]
+            self._postings.append((order, bounds))
+
+        self._totals = {}
+        for r in range(len(self.keys) + 1):
+            for subset in combinations(range(len(self.keys)), r):
+                encoded, inverse = np.unique(self._encode(self._codes[:, list(subset)], subset), return_inverse=True)
+                per_key = np.column_stack([np.bincount(inverse, sums[:, i], minlength=len(encoded))
+                                           for i in range(len(self.values))])
+                self._totals[subset] = (encoded, np.vstack([np.zeros(len(self.values)), np.cumsum(per_key, axis=0)]))
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _strides(self, subset):
+        sizes = self.sizes[list(subset)]
+        return np.r_[np.cumprod(sizes[::-1])[-2::-1], 1].astype(np.int64) if len(sizes) else sizes
+
+    def _encode(self, codes, subset):
+        subset = list(subset)
+        if not subset:
+            return np.zeros(len(codes), dtype=np.int64)
+        return codes.astype(np.int64) @ self._strides(subset)
+
+    def _label_code(self, key, label):
+        lookup = self._label_codes[key]
+        for candidate in (label, str(label), str(label).casefold()):
+            if candidate in lookup:
+                return lookup[candidate]
+        close = difflib.get_close_matches(str(label), [str(x) for x in self.levels[key]], n=3)
+        hint = f" (closest: {', '.join(repr(c) for c in close)})" if close else ""
+        raise KeyError(f"no {key} {label!r}{hint}")
+
+    def _criteria(self, where):
+        """{key position: sorted distinct codes} for the given criteria."""
+        selected = {}
+        for key, value in where.items():
+            if key not in self.keys:
+                raise KeyError(f"no key {key!r} (choose from {', '.join(self.keys)})")
+            if isinstance(value, slice):
+                start = 0 if value.start is None else self._label_code(key, value.start)
+                stop = len(self.levels[key]) - 1 if value.stop is None else self._label_code(key, value.stop)
+                if start > stop:
+                    raise ValueError(f"{key} range {value.start!r}..{value.stop!r} is reversed "
+                                     f"({key} order: {', '.join(map(str, self.levels[key]))})")
+                codes = np.arange(start, stop + 1)
+            elif isinstance(value, (list, tuple, set, frozenset, pd.Index, np.ndarray)):
+                codes = np.unique([self._label_code(key, v) for v in value]).astype(np.int64)
+            else:
+                codes = np.array([self._label_code(key, value)])
+            selected[self.keys.index(key)] = codes
+        return selected
+
+    @traced('query.total', 'query')
+    def total(self, **where):
+        """Summed values (and the mean when there are sums) over the rows matching ``where``."""
+        selected = self._criteria(where)
+        subset = tuple(sorted(selected))
+        encoded, cumulative = self._totals[subset]
+        if not subset:
+            totals = cumulative[-1]
+        elif any(len(codes) == 0 for codes in selected.values()):
+            totals = np.zeros(len(self.values))
+        else:
+            # Every combination of the leading keys, then the last key's runs as blocks
+            strides = self._strides(subset)
+            prefix = np.zeros(1, dtype=np.int64)
+            for position, stride in zip(subset[:-1], strides[:-1]):
+                prefix = (prefix[:, None] + selected[position][None, :] * stride).ravel()
+            starts, stops = _runs(selected[subset[-1]])
+            lo = np.searchsorted(encoded, (prefix[:, None] + starts[None, :]).ravel(), side='left')
+            hi = np.searchsorted(encoded, (prefix[:, None] + stops[None, :]).ravel(), side='right')
+            totals = (cumulative[hi] - cumulative[lo]).sum(axis=0)
+        result = {v: totals[i].astype(self.frame[v].dtype) for i, v in enumerate(self.values)}
+        if 'sum' in result and 'count' in result:
+            result['mean'] = result['sum'] / result['count'] if result['count'] else np.nan
+        return pd.Series(result, dtype=object if len(result) > 1 else None)
+
+    def count(self, **where):
+        return int(self.total(**where)['count'])
+
+    def mean(self, **where):
+        return self.total(**where)['mean']
+
+    @traced('query.rows', 'query')
+    def rows(self, **where):
+        """Aggregated rows matching ``where``, in key order."""
+        selected = self._criteria(where)
+        matches = None
+        # Smallest posting lists first, so the intersections stay small
+        for position, codes in sorted(selected.items(), key=lambda item: self._selected_size(*item)):
+            order, bounds = self._postings[position]
+            starts, stops = _runs(codes) if len(codes) else (codes, codes)
+            positions = np.concatenate([order[bounds[a]:bounds[b + 1]] for a, b in zip(starts, stops)] or [order[:0]])
+            matches = positions if matches is None else np.intersect1d(matches, positions, assume_unique=True)
+        if matches is None:
+            return self.frame
+        return self.frame.iloc[np.sort(matches)]
+
+    def _selected_size(self, position, codes):
+        bounds = self._postings[position][1]
+        return int((bounds[codes + 1] - bounds[codes]).sum())
+
+    def breakdown(self, by, **where):
+        """Totals per ``by`` key(s) over the rows matching ``where``."""
+        by = [by] if isinstance(by, str) else list(by)
+        table = self.rows(**where).groupby(by, observed=True, sort=True)[self.values].sum()
+        if 'sum' in self.values and 'count' in self.values:
+            table['mean'] = table['sum'] / table['count'].where(table['count'] > 0)
+        return table.reset_index()
+
+
+class Query:
+    """The indexed tables of one data directory (``isolates``, ``gram_negative``, ``measurements``)."""
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    def __getattr__(self, name):
+        tables = self.__dict__.get('tables', {})
+        if name in tables:
+            return tables[name]
+        raise AttributeError(f"no table {name!r} (built: {', '.join(tables) or 'none'})")
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def describe(self):
+        """Rows and labels per key of every table."""
+        return pd.DataFrame([(name, len(table), key, len(table.levels[key]))
+                             for name, table in self.tables.items() for key in table.keys],
+                            columns=['table', 'rows', 'key', 'labels'])
+
+
+def isolate_index(store):
+    """Isolates per (cycle, location, medium, genus, Gram type) from the aggregate store."""
+    from microbio.gram import load_gram_registry
+    from microbio.store import cycle_sort_key
+
+    counts = store.cycle_counts(include_missing=True)
+    counts = counts.assign(gram=np.asarray(load_gram_registry().classify(counts['genus']), dtype=object))
+    return FactIndex(counts, ISOLATE_KEYS, ['count'], orders={'cycle': cycle_sort_key})
+
+
+def gram_negative_index(df):
+    """Isolates per (location, sampling method, genus) from the G(-) sheet."""
+    from microbio.analyses.method_averages import detect_methods
+    from microbio.locations import load_location_registry
+    from microbio.taxonomy import genus_column
+
+    rows = pd.DataFrame({
+        'location': pd.Series(load_location_registry().resolve(df['Miejsce poboru']), index=df.index, dtype=object),
+        'method': detect_methods(df['Metoda poboru']),
+        'genus': np.asarray(genus_column(df['Rodzaj/gatunek']), dtype=object),
+        'count': 1,
+    }).dropna(subset=['location'])
+    return FactIndex(rows, GRAM_NEGATIVE_KEYS, ['count'])
+
+
+def measurement_index(store):
+    """Measurement sums and counts per (source, location, method) from the aggregate store."""
+    sums = store.measurement_sums.dropna(subset=MEASUREMENT_KEYS)
+    return FactIndex(sums.astype({key: str for key in MEASUREMENT_KEYS}), MEASUREMENT_KEYS, ['sum', 'count'])
+
+
+def table_inputs(tables):
+    """INPUTS-style {key: (workbook, sheet)} for the given tables."""
+    unknown = [name for name in tables if name not in TABLE_INPUTS]
+    if unknown:
+        raise KeyError(f"no table {', '.join(unknown)} (choose from {', '.join(TABLE_INPUTS)})")
+    return {key: source for name in tables for key, source in TABLE_INPUTS[name].items()}
+
+
+@traced('query.open', 'query')
+def open_query(data_dir, tables=None, frames=None):
+    """Query over ``tables`` (default: all) of ``data_dir``, refreshing the aggregate store first."""
+    from microbio.store import open_store
+    from microbio.workbooks import load_inputs
+
+    tables = list(TABLE_INPUTS) if tables is None else list(tables)
+    frames = frames or load_inputs(table_inputs(tables), data_dir)
+    store = open_store(data_dir)
+    with span('query.refresh'):
+        if 'isolates' in tables:
+            store.update_isolates(frames['isolates'])
+        if 'measurements' in tables:
+            store.update_measurements('culture', datasets.culture_measurements(frames['culture']),
+                                      ['sedimentation', 'pluczka'])
+            store.update_measurements('pcr', datasets.pcr_measurements(frames['pcr']), ['qPCR', 'sec', 'regA'])
+        store.save()
+
+    built = {}
+    with span('query.index'):
+        if 'isolates' in tables:
+            built['isolates'] = isolate_index(store)
+        if 'gram_negative' in tables:
+            built['gram_negative'] = gram_negative_index(frames['gram_negative'])
+        if 'measurements' in tables:
+            built['measurements'] = measurement_index(store)
+    return Query(built)
+
+
+def parse_criterion(text):
+    """'key=value' from the command line: 'a,b' is a list, 'a..b' an inclusive range (either end open)."""
+    key, sep, value = text.partition('=')
+    if not sep or not key:
+        raise ValueError(f"expected key=value, got {text!r}")
+    if '..' in value:
+        start, _, stop = value.partition('..')
+        return key, slice(start or None, stop or None)
+    if ',' in value:
+        return key, [v for v in value.split(',') if v]
+    return key, value
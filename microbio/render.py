@@ -0,0 +1,224 @@
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+from microbio.tracing import span
+
+# === Interactive display or headless batch export ===
+# Analyses hand every figure to a Renderer as (name, builder, args). Interactively the
+# figure is built and shown as before. In batch mode (--batch DIR or MICROBIO_BATCH_DIR)
+# figures are built and written to DIR in a process pool, and the run ends with
+# DIR/manifest.json listing the files and per-figure timings. The 'dashboard' format
+# collects every figure of the directory into one DIR/dashboard.html (see
+# microbio.dashboard); without --batch it is built in a temporary directory and opened
+# in the browser instead of one page per figure. A figure whose builder raises is
+# recorded in the manifest as failed; the other figures are still exported and the
+# error is raised once everything has been collected.
+DEFAULT_FORMATS = ('html',)
+SUPPORTED_FORMATS = ('html', 'png', 'svg', 'dashboard')
+
+
+def slugify(name):
+    return re.sub(r'[^\w.-]+', '_', str(name)).strip('_') or 'figure'
+
+
+def _is_matplotlib(fig):
+    return type(fig).__module__.startswith('matplotlib')
+
+
+def export_figure(name, builder, args, kwargs, output_dir, formats):
+    """Build one figure and write it in every requested format (runs in a worker)."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+    record = {'name': name, 'files': [], 'skipped': [], 'errors': []}
+    start = time.perf_counter()
+    fig = builder(*args, **kwargs)
+    record['build_seconds'] = round(time.perf_counter() - start, 4)
+
+    if _is_matplotlib(fig) and {'html', 'dashboard'} & set(formats):
+        # No html backend for matplotlib: fall back to png so the figure is not lost
+        record['skipped'] += [fmt for fmt in formats if fmt in ('html', 'dashboard')]
+        formats = list(dict.fromkeys('png' if fmt in ('html', 'dashboard') else fmt for fmt in formats))
+
+    start = time.perf_counter()
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{slugify(name)}.{fmt}")
+        try:
+            if _is_matplotlib(fig):
+                fig.savefig(path, format=fmt)
+            elif fmt == 'dashboard':
+                from microbio.dashboard import FIGURE_SUFFIX
+
+                path = os.path.join(output_dir, slugify(name) + FIGURE_SUFFIX)
+                with open(path, 'w', encoding='utf-8') as fh:
+                    fh.write(fig.to_json())
+            elif fmt == 'html':
+                fig.write_html(path)
+            else:
+                fig.write_image(path, format=fmt)  # needs kaleido
+        except Exception as exc:
+            record['errors'].append(f"{fmt}: {' '.join(str(exc).split())}")
+            continue
+        record['files'].append(os.path.basename(path))
+    record['export_seconds'] = round(time.perf_counter() - start, 4)
+
+    if _is_matplotlib(fig):
+        import matplotlib.pyplot as plt
+        plt.close(fig)
+    return record
+
+
+class Renderer:
+    def __init__(self, output_dir=None, formats=DEFAULT_FORMATS, workers=None, section=None, keep_pool=False):
+        self.formats = tuple(formats)
+        self.open_dashboard = output_dir is None and 'dashboard' in self.formats
+        if self.open_dashboard:
+            import tempfile
+
+            output_dir = tempfile.mkdtemp(prefix='microbio-dashboard-')
+            self.formats = ('dashboard',)
+        self.output_dir = output_dir
+        self.workers = workers
+        self.section = section
+        self.keep_pool = keep_pool  # reuse the export processes across finish() calls (watch mode)
+        self._pool = None
+        self._pending = []    # (name, future)
+        self._records = []
+        self._failures = []   # (name, exception)
+        self._started = time.perf_counter()
+        unknown = set(self.formats) - set(SUPPORTED_FORMATS)
+        if unknown:
+            raise ValueError(f"Unsupported figure format(s): {', '.join(sorted(unknown))}")
+
+    @property
+    def batch(self):
+        return self.output_dir is not None
+
+    def _executor(self):
+        if self._pool is None and self.workers != 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def submit(self, name, builder, *args, **kwargs):
+        """Show the figure now (interactive) or queue it for export (batch)."""
+        if not self.batch:
+            with span(f'figure {name}', 'figure'):
+                fig = builder(*args, **kwargs)
+            if _is_matplotlib(fig):
+                import matplotlib.pyplot as plt
+                plt.show()
+            else:
+                fig.show()
+            return
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        pool = self._executor()
+        job = (name, builder, args, kwargs, self.output_dir, self.formats)
+        if pool is None:
+            with span(f'figure {name}', 'figure'):
+                try:
+                    self._records.append(dict(export_figure(*job), section=self.section))
+                except Exception as exc:
+                    self._failed(name, exc)
+        else:
+            self._pending.append((name, pool.submit(export_figure, *job)))
+
+    def _failed(self, name, exc):
+        self._failures.append((name, exc))
+        self._records.append({'name': name, 'files': [], 'skipped': [], 'failed': True,
+                              'errors': [f"build: {type(exc).__name__}: {' '.join(str(exc).split())}"],
+                              'section': self.section})
+
+    def finish(self):
+        """Wait for queued exports and write the manifest; returns its path in batch mode."""
+        if not self.batch:
+            return None
+        with span('wait for figure exports', 'figure', figures=len(self._pending)):
+            for name, future in self._pending:
+                try:
+                    self._records.append(dict(future.result(), section=self.section))
+                except Exception as exc:
+                    self._failed(name, exc)
+        self._pending = []
+        if not self.keep_pool:
+            self.close()
+
+        manifest = {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'command': ' '.join([os.path.basename(sys.argv[0])] + sys.argv[1:]),
+            'formats': list(self.formats),
+            'total_seconds': round(time.perf_counter() - self._started, 4),
+            'figures': self._records,
+        }
+        path = os.path.join(self.output_dir, 'manifest.json')
+        if os.path.exists(path):
+            # Several scripts may share one output directory: keep earlier entries, except
+            # this command's own figures from a previous run (they may no longer exist)
+            try:
+                with open(path, encoding='utf-8') as fh:
+                    previous = json.load(fh)
+                names = {r['name'] for r in self._records}
+                manifest['figures'] = [r for r in previous.get('figures', [])
+                                       if r['name'] not in names
+                                       and (self.section is None or r.get('section') != self.section)] + self._records
+            except (OSError, ValueError):
+                pass
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(manifest, fh, ensure_ascii=False, indent=2)
+
+        failed = sum(1 for r in self._records if r['errors'])
+        print(f"🖼️ Exported {len(self._records)} figure(s) to {self.output_dir}"
+              + (f" ({failed} with errors, see manifest.json)" if failed else ""))
+
+        if 'dashboard' in self.formats:
+            from microbio.dashboard import write_dashboard
+
+            with span('dashboard', 'figure'):
+                dashboard = write_dashboard(self.output_dir, manifest['figures'])
+            print(f"📊 Dashboard: {dashboard} ({os.path.getsize(dashboard) / 2**20:.1f} MB)")
+            if self.open_dashboard:
+                import webbrowser
+
+                webbrowser.open('file://' + os.path.abspath(dashboard))
+
+        failures, self._failures = self._failures, []
+        if failures:
+            names = ', '.join(name for name, _ in failures)
+            raise RuntimeError(f"{len(failures)} figure(s) could not be built: {names} "
+                               f"(see {path})") from failures[0][1]
+        return path
+
+    def begin(self, section):
+        """Start a new section on a reused renderer, dropping anything left from a failed one."""
+        self.section = section
+        self._pending = []
+        self._records = []
+        self._failures = []
+        self._started = time.perf_counter()
+
+    def close(self):
+        """Shut the export process pool down."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def add_render_arguments(parser):
+    parser.add_argument('--batch', metavar='DIR', default=os.environ.get('MICROBIO_BATCH_DIR'),
+                        help="write figures to DIR instead of showing them (env: MICROBIO_BATCH_DIR)")
+    parser.add_argument('--formats', default=os.environ.get('MICROBIO_FORMATS', ','.join(DEFAULT_FORMATS)),
+                        help="comma-separated export formats: html, png, svg, dashboard (env: MICROBIO_FORMATS)")
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('MICROBIO_WORKERS', 0)) or None,
+                        help="export processes, default: all cores (env: MICROBIO_WORKERS)")
+    return parser
+
+
+def renderer_from_args(args):
+    formats = [f.strip().lower() for f in args.formats.split(',') if f.strip()]
+    return Renderer(args.batch, formats, args.workers, section=getattr(args, 'command', None))
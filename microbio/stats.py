@@ -0,0 +1,170 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from microbio.locations import CONTROL_GROUP, OTHER_GROUP
+from microbio.tracing import traced
+
+# === Batched group comparisons ===
+# Every (measurement column × group contrast) pair becomes one row of two NaN-padded
+# matrices. Rows with equal sample sizes are packed into dense blocks and tested with
+# one axis-aware scipy call per block (Shapiro-Wilk, Welch t-test, Mann–Whitney U),
+# so the cost does not grow with one Python call per variable. Shapiro-Wilk only runs
+# on 3..5000 values (scipy's p-value is unreliable above that); outside the range the
+# Shapiro p-value is reported as NaN and the groups are compared with Mann–Whitney U.
+NORMALITY_ALPHA = 0.05
+MIN_SHAPIRO_N = 3  # minimum sample size for Shapiro
+MAX_SHAPIRO_N = 5000  # scipy warns that larger p-values may not be accurate
+
+RESULT_COLUMNS = [
+    'variable', 'group_a', 'group_b', 'n_a', 'n_b', 'mean_a', 'mean_b', 'median_a', 'median_b',
+    'shapiro_p_a', 'shapiro_p_b', 'test', 'statistic', 'p_value', 'p_holm', 'p_bh',
+]
+
+
+def holm(p_values):
+    """Holm step-down adjusted p-values; NaNs are ignored and stay NaN."""
+    p = np.asarray(p_values, dtype=np.float64)
+    out = np.full(p.shape, np.nan)
+    ok = ~np.isnan(p)
+    m = ok.sum()
+    if m:
+        order = np.argsort(p[ok])
+        adjusted = np.maximum.accumulate((m - np.arange(m)) * p[ok][order])
+        res = np.empty(m)
+        res[order] = np.minimum(adjusted, 1.0)
+        out[ok] = res
+    return out
+
+
+def benjamini_hochberg(p_values):
+    """Benjamini–Hochberg (FDR) adjusted p-values; NaNs are ignored and stay NaN."""
+    p = np.asarray(p_values, dtype=np.float64)
+    out = np.full(p.shape, np.nan)
+    ok = ~np.isnan(p)
+    m = ok.sum()
+    if m:
+        order = np.argsort(p[ok])[::-1]
+        ranks = np.arange(m, 0, -1)
+        adjusted = np.minimum.accumulate(p[ok][order] * m / ranks)
+        res = np.empty(m)
+        res[order] = np.minimum(adjusted, 1.0)
+        out[ok] = res
+    return out
+
+
+def _padded(samples):
+    """List of 1-D arrays -> (rows × max_n) matrix, NaN-padded, values first."""
+    width = max((len(s) for s in samples), default=0)
+    out = np.full((len(samples), max(width, 1)), np.nan)
+    for i, s in enumerate(samples):
+        out[i, :len(s)] = s
+    return out
+
+
+def _blocks(*sizes):
+    """Row indices grouped by identical sample sizes across the given count arrays."""
+    keys = np.stack(sizes, axis=1)
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    for k, key in enumerate(unique):
+        yield tuple(int(n) for n in key), np.flatnonzero(inverse.ravel() == k)
+
+
+def _shapiro_p(matrix, n):
+    from scipy.stats import shapiro
+
+    p = np.zeros(len(matrix))  # too few or too many values -> 0, which forces the nonparametric test
+    for (size,), rows in _blocks(n):
+        if MIN_SHAPIRO_N <= size <= MAX_SHAPIRO_N:
+            p[rows] = shapiro(matrix[rows, :size], axis=1).pvalue
+    return p
+
+
+def _shapiro_tested(n):
+    return (n >= MIN_SHAPIRO_N) & (n <= MAX_SHAPIRO_N)
+
+
+def _two_sample(test, a, b, n_a, n_b, rows, alternative):
+    from scipy.stats import mannwhitneyu, ttest_ind
+
+    stat = np.full(len(rows), np.nan)
+    p = np.full(len(rows), np.nan)
+    for (size_a, size_b), block in _blocks(n_a[rows], n_b[rows]):
+        xa = a[rows[block], :size_a]
+        xb = b[rows[block], :size_b]
+        if test == "t-test":
+            res = ttest_ind(xa, xb, axis=1, equal_var=False, alternative=alternative)
+        else:
+            res = mannwhitneyu(xa, xb, axis=1, alternative=alternative)
+        stat[block] = res.statistic
+        p[block] = res.pvalue
+    return stat, p
+
+
+@traced('compare_groups', 'stats')
+def compare_groups(df, value_cols, group_col="group", contrasts=None, alternative="less"):
+    """Test every value column for every (group_a, group_b) contrast in one pass.
+
+    ``contrasts`` defaults to WPN (control) vs Other locations. ``alternative`` is
+    relative to group_a (``'less'``: group_a has lower values). Returns one tidy row
+    per (variable, contrast) with raw, Holm- and BH-adjusted p-values; the
+    adjustments run over the whole table.
+    """
+    if contrasts is None:
+        contrasts = [(CONTROL_GROUP, OTHER_GROUP)]
+    value_cols = [c for c in value_cols if c in df.columns]
+
+    # Split each column by group once, dropping NaNs
+    groups = df[group_col]
+    by_group = {
+        g: {c: df.loc[groups == g, c].dropna().to_numpy(dtype=np.float64) for c in value_cols}
+        for g in {g for pair in contrasts for g in pair}
+    }
+
+    keys = [(c, a, b) for a, b in contrasts for c in value_cols]
+    if not keys:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    a = _padded([by_group[ga][c] for c, ga, _ in keys])
+    b = _padded([by_group[gb][c] for c, _, gb in keys])
+    n_a = (~np.isnan(a)).sum(axis=1)
+    n_b = (~np.isnan(b)).sum(axis=1)
+
+    # Values are packed to the left of each row, so a[:, :n] is dense
+    p_norm_a = _shapiro_p(a, n_a)
+    p_norm_b = _shapiro_p(b, n_b)
+
+    enough = (n_a >= 1) & (n_b >= 1)
+    normal = enough & (p_norm_a > NORMALITY_ALPHA) & (p_norm_b > NORMALITY_ALPHA)
+    test = np.where(normal, "t-test", np.where(enough, "Mann–Whitney U", "Insufficient data"))
+
+    stat = np.full(len(keys), np.nan)
+    p_val = np.full(len(keys), np.nan)
+    for name in ("t-test", "Mann–Whitney U"):
+        rows = np.flatnonzero(test == name)
+        if len(rows):
+            stat[rows], p_val[rows] = _two_sample(name, a, b, n_a, n_b, rows, alternative)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # empty groups
+        mean_a, mean_b = np.nanmean(a, axis=1), np.nanmean(b, axis=1)
+        median_a, median_b = np.nanmedian(a, axis=1), np.nanmedian(b, axis=1)
+
+    return pd.DataFrame({
+        'variable': [k[0] for k in keys],
+        'group_a': [k[1] for k in keys],
+        'group_b': [k[2] for k in keys],
+        'n_a': n_a,
+        'n_b': n_b,
+        'mean_a': mean_a,
+        'mean_b': mean_b,
+        'median_a': median_a,
+        'median_b': median_b,
+        'shapiro_p_a': np.where(_shapiro_tested(n_a), p_norm_a, np.nan),
+        'shapiro_p_b': np.where(_shapiro_tested(n_b), p_norm_b, np.nan),
+        'test': test,
+        'statistic': stat,
+        'p_value': p_val,
+        'p_holm': holm(p_val),
+        'p_bh': benjamini_hochberg(p_val),
+    }, columns=RESULT_COLUMNS)
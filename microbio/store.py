@@ -0,0 +1,220 @@
+import hashlib
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from microbio import datasets
+from microbio.locations import load_location_registry
+from microbio.tracing import traced
+from microbio.workbooks import cache_dir_for
+
+# === Persisted aggregate store ===
+# Keeps per-(cycle, location, medium, genus) isolate counts and per-(source, location,
+# method) measurement sums/counts between runs. Sampling campaigns only append, so a
+# refresh fingerprints the raw rows and aggregates only what changed:
+#   * isolates: cycles whose rows (count + content hash) differ are recomputed, others kept
+#   * measurements: if the stored rows are an unchanged prefix, only the appended rows
+#     are parsed and added; anything else triggers a rebuild of that source
+# The stored keys are derived values (canonical location codes, resolved genera), so the
+# store also records a digest of the registries and resolver settings behind them and is
+# discarded when any of those change. With MICROBIO_CACHE_DIR shared between data
+# directories, every data directory (or --inputs campaign) keeps its own store file.
+STORE_VERSION = 3
+STORE_STEM = 'aggregates'
+MISSING_CYCLE = '<brak>'  # rows without a 'Pobór' value
+
+ISOLATE_KEYS = ['cycle', 'location', 'medium', 'genus']
+MEASUREMENT_KEYS = ['source', 'location', 'method']
+
+
+def _row_hashes(df):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def _digest(hashes):
+    return hashlib.sha1(np.ascontiguousarray(hashes).tobytes()).hexdigest()
+
+
+def derivation_digest():
+    """Digest of the location/Gram registries and genus resolver settings that derive the stored keys."""
+    from microbio import genus_resolver, gram, locations
+
+    reference_path, max_distance = genus_resolver.resolver_settings()
+    digest = hashlib.sha1(f"{genus_resolver.RESOLVER_VERSION}\0{max_distance}".encode('utf-8'))
+    for path in (locations.registry_path(), gram.registry_path(), reference_path):
+        digest.update(b'\0')
+        if path and os.path.exists(path):
+            with open(path, 'rb') as fh:
+                digest.update(fh.read())
+    return digest.hexdigest()
+
+
+class AggregateStore:
+    def __init__(self, path=None):
+        self.path = path
+        self.isolate_counts = pd.DataFrame({'cycle': pd.Series(dtype=object), 'location': pd.Series(dtype=object),
+                                            'medium': pd.Series(dtype=object), 'genus': pd.Series(dtype=object),
+                                            'count': pd.Series(dtype=np.int64)})
+        self.isolate_fingerprints = {}      # cycle -> (rows, digest)
+        self.measurement_sums = pd.DataFrame({'source': pd.Series(dtype=object), 'location': pd.Series(dtype=object),
+                                              'method': pd.Series(dtype=object), 'sum': pd.Series(dtype=np.float64),
+                                              'count': pd.Series(dtype=np.int64)})
+        self.measurement_fingerprints = {}  # source -> (rows, digest of those rows)
+        self._cube = None
+
+    @classmethod
+    def load(cls, path):
+        """Store from ``path``; an empty one if it is missing, unreadable or outdated."""
+        store = cls(path)
+        if os.path.exists(path):
+            try:
+                state = pd.read_pickle(path)
+            except Exception:
+                state = None
+            if (isinstance(state, dict) and state.get('version') == STORE_VERSION
+                    and state.get('derivation') == derivation_digest()):
+                store.__dict__.update(state['tables'])
+                store._cube = None
+        return store
+
+    def save(self):
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tables = {k: v for k, v in self.__dict__.items() if k not in ('path', '_cube')}
+        tmp = self.path + f".{os.getpid()}.tmp"
+        pd.to_pickle({'version': STORE_VERSION, 'derivation': derivation_digest(), 'tables': tables}, tmp)
+        os.replace(tmp, self.path)
+
+    # === Isolates ===
+    @traced('store.update_isolates', 'aggregate')
+    def update_isolates(self, raw):
+        """Merge a raw isolate sheet in; returns the cycles that were (re)aggregated."""
+        raw = raw.copy()
+        raw.columns = raw.columns.str.strip()
+        cycles = raw['Pobór'].astype(object).where(raw['Pobór'].notna(), MISSING_CYCLE).astype(str)
+
+        hashes = _row_hashes(raw)
+        fingerprints = {}
+        for cycle, rows in pd.Series(np.arange(len(raw))).groupby(cycles.to_numpy(), sort=False):
+            fingerprints[cycle] = (len(rows), _digest(hashes[rows.to_numpy()]))
+
+        changed = [c for c, fp in fingerprints.items() if self.isolate_fingerprints.get(c) != fp]
+        removed = [c for c in self.isolate_fingerprints if c not in fingerprints]
+        if not changed and not removed:
+            return []
+
+        keep = ~self.isolate_counts['cycle'].isin(changed + removed)
+        delta = raw[cycles.isin(changed).to_numpy()]
+        if len(delta):
+            df = datasets.isolates(delta)
+            counts = df.groupby([
+                cycles[df.index].rename('cycle'),
+                pd.Series(load_location_registry().resolve(df['Miejsce_poboru']), index=df.index,
+                          dtype=object).fillna('Unknown').rename('location'),
+                df['Podloze'].rename('medium'),
+                df['Rodzaj'].astype(str).rename('genus'),
+            ], observed=True).size().reset_index(name='count')
+        else:
+            counts = self.isolate_counts.iloc[:0]
+        self.isolate_counts = pd.concat([self.isolate_counts[keep], counts], ignore_index=True)
+        self.isolate_fingerprints = fingerprints
+        self._cube = None
+        return changed
+
+    def cycle_counts(self, include_missing=False):
+        counts = self.isolate_counts
+        if not include_missing:
+            counts = counts[counts['cycle'] != MISSING_CYCLE]
+        return counts
+
+    @traced('store.cube', 'aggregate')
+    def cube(self):
+        """Hierarchical count cube over all cycles, built once per change of the counts."""
+        if self._cube is None:
+            from microbio.cube import IsolateCube
+
+            self._cube = IsolateCube.from_counts(self.isolate_counts, cycle_order=cycle_sort_key)
+        return self._cube
+
+    # === Measurements ===
+    @traced('store.update_measurements', 'aggregate')
+    def update_measurements(self, source, frame, methods):
+        """Add the rows of ``frame`` (lokalizacja + parsed ``methods``) not yet seen; returns their number.
+
+        ``frame`` is the parsed measurement table in sheet order, e.g.
+        ``datasets.culture_measurements(raw)``.
+        """
+        frame = frame[['lokalizacja'] + list(methods)].assign(lokalizacja=frame['lokalizacja'].astype(object))
+        hashes = _row_hashes(frame)
+        seen_rows, seen_digest = self.measurement_fingerprints.get(source, (0, None))
+        existing = self.measurement_sums['source'] == source
+        if seen_rows > len(frame) or (seen_rows and _digest(hashes[:seen_rows]) != seen_digest):
+            # Rows were edited or removed, not just appended: rebuild this source
+            seen_rows = 0
+            self.measurement_sums = self.measurement_sums[~existing]
+            existing = self.measurement_sums['source'] == source
+
+        delta = frame.iloc[seen_rows:]
+        if len(delta):
+            long = delta.melt(id_vars='lokalizacja', value_vars=list(methods), var_name='method')
+            long['value'] = long['value'].astype(np.float64)  # accumulate compact float32 columns in float64
+            sums = long.groupby(['lokalizacja', 'method'], sort=False)['value'].agg(['sum', 'count']).reset_index()
+            sums = sums.rename(columns={'lokalizacja': 'location'})
+            sums.insert(0, 'source', source)
+            merged = pd.concat([self.measurement_sums[existing], sums], ignore_index=True)
+            merged = merged.groupby(MEASUREMENT_KEYS, sort=False, dropna=False)[['sum', 'count']].sum().reset_index()
+            self.measurement_sums = pd.concat([self.measurement_sums[~existing], merged], ignore_index=True)
+
+        self.measurement_fingerprints[source] = (len(frame), _digest(hashes))
+        return len(delta)
+
+    def measurement_means(self):
+        """Mean per location (rows) and method (columns) from the stored sums and counts."""
+        sums = self.measurement_sums
+        means = sums.assign(mean=sums['sum'] / sums['count'].where(sums['count'] > 0))
+        return means.pivot(index='location', columns='method', values='mean')
+
+
+def store_path(data_dir):
+    key = hashlib.sha1(os.path.abspath(data_dir).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir_for(os.path.join(data_dir, datasets.ISOLATE_WORKBOOK)), f"{STORE_STEM}-{key}.pkl")
+
+
+_open_stores = {}
+
+
+def open_store(data_dir):
+    """The persisted store for ``data_dir``; in-memory only when MICROBIO_NO_CACHE is set.
+
+    Analyses run in the same process share one instance, so the isolate table is
+    aggregated (and the cube built) once per run.
+    """
+    path = None if os.environ.get('MICROBIO_NO_CACHE') else store_path(data_dir)
+    key = path or os.path.abspath(data_dir)
+    if key not in _open_stores:
+        _open_stores[key] = AggregateStore(path) if path is None else AggregateStore.load(path)
+    return _open_stores[key]
+
+
+_ROMAN = re.compile(r'^M{0,3}(CM|CD|D?C{0,3})(XC|XL|L?X{0,3})(IX|IV|V?I{0,3})$')
+_ROMAN_VALUES = {'M': 1000, 'D': 500, 'C': 100, 'L': 50, 'X': 10, 'V': 5, 'I': 1}
+
+
+def roman_value(text):
+    """Value of an upper-case Roman numeral ('IX' -> 9); None for anything else."""
+    if not text or not _ROMAN.match(text):
+        return None
+    values = [_ROMAN_VALUES[ch] for ch in text]
+    return sum(-v if v < following else v for v, following in zip(values, values[1:] + [0]))
+
+
+def cycle_sort_key(cycle):
+    """Numeric and Roman-numeral cycles (I, II, ..., IX, X) in numeric order, other text by name."""
+    try:
+        return 0, float(cycle), ''
+    except ValueError:
+        value = roman_value(str(cycle).strip())
+        return (0, float(value), '') if value is not None else (1, 0.0, cycle)
@@ -0,0 +1,136 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from microbio import datasets
+from microbio.gram import load_gram_registry
+
+# === Synthetic lab workbooks ===
+# Frames shaped like the real sheets (same workbook/sheet names and Polish headers,
+# the same mix of "3,6×10^2" text and plain numbers, strain-suffixed 16S names,
+# blanks and "No significant similarity" rows) at any size, for benchmarks and
+# for trying the analyses without the lab data. The number of distinct species
+# names grows with the row count, like a real multi-campaign archive.
+EXCEL_MAX_ROWS = 1_048_575  # one header row
+
+LOCATIONS = ['KG', 'GB', 'MU', 'WPN']
+CYCLES = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X']
+MEDIA = ['EMB', 'BEC', 'CETR', 'CLED', 'no information']
+MEDIUM_WEIGHTS = [0.37, 0.35, 0.2, 0.075, 0.005]
+SAMPLING_METHODS = ['hodowla', 'płuczka', 'sedymentacja']
+SPECIES_SUFFIXES = ['sp.', 'agglomerans', 'putida', 'helmanticensis', 'aerogenes', 'chroococcum']
+NO_MATCH = 'No significant similarity found.'
+
+
+def _scientific_text(values):
+    """Render counts the way they are typed in the culture sheet, e.g. '3,6×10^2'."""
+    exponent = np.floor(np.log10(np.maximum(values, 1e-12))).astype(np.int64)
+    mantissa = np.round(values / np.power(10.0, exponent), 1)
+    text = pd.Series(mantissa).map('{:.1f}'.format).str.replace('.', ',', regex=False)
+    return (text + '×10^' + pd.Series(exponent).astype(str)).to_numpy(dtype=object)
+
+
+def _counts_column(rng, n, mean_log, blank_fraction=0.03):
+    """Lognormal counts, mostly as scientific text, some plain numbers and blanks."""
+    values = rng.lognormal(mean_log, 1.0, n)
+    out = _scientific_text(values)
+    plain = rng.random(n) < 0.2
+    out[plain] = np.round(values[plain], 2)
+    out[rng.random(n) < blank_fraction] = None
+    return out
+
+
+def _species_names(rng, n):
+    """16S result names: '<Genus> <epithet>' or BLAST-style strain descriptions."""
+    registry = load_gram_registry()
+    genera = np.array([g.capitalize() for g in sorted(registry.by_genus)] + ['Uncultured', 'Bacterium'], dtype=object)
+    genus = genera[rng.integers(len(genera), size=n)]
+    epithet = np.array(SPECIES_SUFFIXES, dtype=object)[rng.integers(len(SPECIES_SUFFIXES), size=n)]
+    names = pd.Series(genus + ' ' + epithet)
+
+    # Strain descriptions make the distinct-name count grow with the data (~√n·10)
+    strains = rng.random(n) < 0.3
+    strain_ids = rng.integers(max(10, int(np.sqrt(n) * 10)), size=int(strains.sum()))
+    names[strains] = (names[strains] + ' strain ' + pd.Series(strain_ids, index=names.index[strains]).astype(str)
+                      + ' 16S ribosomal RNA gene, partial sequence')
+    names[rng.random(n) < 0.03] = NO_MATCH
+    names[rng.random(n) < 0.01] = None
+    return names.to_numpy(dtype=object)
+
+
+def culture_frame(n, rng):
+    return pd.DataFrame({
+        'Pobór': rng.choice(CYCLES, n),
+        'lokalizacja': rng.choice(LOCATIONS, n),
+        datasets.SEDIMENTATION_COLUMN: _counts_column(rng, n, 6.3),
+        datasets.SCRUBBER_COLUMN: _counts_column(rng, n, 5.2),
+    })
+
+
+def gram_negative_frame(n, rng):
+    return pd.DataFrame({
+        'Pobór': rng.choice(CYCLES, n),
+        'Miejsce poboru': rng.choice(LOCATIONS, n),
+        'Metoda poboru': rng.choice(SAMPLING_METHODS, n),
+        'Rodzaj/gatunek': _species_names(rng, n),
+    })
+
+
+def pcr_frame(n, rng):
+    regA = rng.lognormal(3, 1.2, n)
+    sec = np.where(rng.random(n) < 0.4, 0.0, rng.lognormal(1, 1, n))
+    dilution = rng.choice([1.0, 2.0, 5.0, 10.0], n)
+    frame = pd.DataFrame({
+        'Lokalizacja': rng.choice(LOCATIONS, n),
+        'Pobór': rng.choice(CYCLES, n),
+        'Mean regA Conc. [cp/µL] (dPCR reaction)': regA,
+        'Mean sec Conc. [cp/µL] (dPCR reaction)': sec,
+        'qPCR Starting Quantity (SQ) Mean': rng.lognormal(7, 1.3, n),
+        'rozcieńczenie': dilution,
+        '×15 (3ml / 200mikrol)': 15.0,
+        'mikrolitry eluatu': 100.0,
+    })
+    frame['regA, mean DNA amount for m3'] = regA * dilution * 15.0 * 100.0
+    frame['sec, mean DNA amount for m3'] = sec * dilution * 15.0 * 100.0
+    return frame
+
+
+def isolate_frame(n, rng):
+    return pd.DataFrame({
+        'Pobór': rng.choice(CYCLES, n),
+        'Miejsce_poboru': rng.choice(LOCATIONS, n),
+        # The header has a leading space in the lab workbook
+        ' ' + datasets.MEDIUM_COLUMN: rng.choice(MEDIA, n, p=MEDIUM_WEIGHTS),
+        datasets.SPECIES_COLUMN: _species_names(rng, n),
+    })
+
+
+def synthetic_frames(n_rows, seed=0):
+    """{(workbook, sheet): frame} for every sheet the analyses read, ``n_rows`` rows each."""
+    rng = np.random.default_rng(seed)
+    return {
+        (datasets.CULTURE_WORKBOOK, datasets.CULTURE_SHEET): culture_frame(n_rows, rng),
+        (datasets.CULTURE_WORKBOOK, datasets.GRAM_NEGATIVE_SHEET): gram_negative_frame(n_rows, rng),
+        (datasets.PCR_WORKBOOK, datasets.PCR_SHEET): pcr_frame(n_rows, rng),
+        (datasets.ISOLATE_WORKBOOK, datasets.ISOLATE_SHEET): isolate_frame(n_rows, rng),
+    }
+
+
+def write_workbooks(frames, data_dir):
+    """Write synthetic frames as .xlsx workbooks into ``data_dir``; returns the paths."""
+    too_long = [sheet for (_, sheet), frame in frames.items() if len(frame) > EXCEL_MAX_ROWS]
+    if too_long:
+        raise ValueError(f"Sheets longer than Excel allows ({EXCEL_MAX_ROWS} rows): {', '.join(too_long)}")
+    os.makedirs(data_dir, exist_ok=True)
+    by_workbook = {}
+    for (workbook, sheet), frame in frames.items():
+        by_workbook.setdefault(workbook, []).append((sheet, frame))
+    paths = []
+    for workbook, sheets in by_workbook.items():
+        path = os.path.join(data_dir, workbook)
+        with pd.ExcelWriter(path) as writer:
+            for sheet, frame in sheets:
+                frame.to_excel(writer, sheet_name=sheet, index=False)
+        paths.append(path)
+    return paths
@@ -0,0 +1,45 @@
+import re
+from functools import lru_cache
+
+import pandas as pd
+
+from microbio.genus_resolver import load_genus_resolver
+from microbio.tracing import traced
+
+# === Genus extraction from cleaned 16S names ===
+# Isolate tables repeat a few hundred distinct names, so the regex work is done once
+# per distinct string (pd.factorize) and memoised across calls and tables. The distinct
+# genera then go through the fuzzy resolver (microbio.genus_resolver), which maps case
+# slips and misspellings onto the reference spelling the Gram registry knows.
+_BRACKETS = re.compile(r'[\[\]\(\)]')
+_LEADING_ARTICLE = re.compile(r'^[Aa]\s+')
+
+GENUS_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=GENUS_CACHE_SIZE)
+def extract_genus(name):
+    """'Pseudomonas sp./Pseudomonas graminis' -> 'Pseudomonas'; '' when nothing is left."""
+    name = _BRACKETS.sub('', name)
+    name = _LEADING_ARTICLE.sub('', name)
+    name = name.strip().split('/')[0]
+    return name.split()[0] if name else ''
+
+
+@traced('genus_column', 'taxonomy')
+def genus_column(names):
+    """Genus for every row of a 'Rodzaj/gatunek (po czyszczeniu)' column, as a Categorical.
+
+    Missing names map to '' like the old per-row helper did.
+    """
+    codes, uniques = pd.factorize(pd.Series(names, copy=False), use_na_sentinel=True)
+    resolver = load_genus_resolver()
+    genera = resolver.resolve([extract_genus(str(u)) for u in uniques])
+    resolver.report_corrections()
+    genus_codes, categories = pd.factorize(pd.Index(genera + [''], dtype=object))
+    # The trailing '' is what missing names (factorize code -1) pick up
+    return pd.Categorical.from_codes(genus_codes[codes], categories=categories)
+
+
+def genus_cache_info():
+    return extract_genus.cache_info()
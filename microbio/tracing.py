@@ -0,0 +1,202 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# === Stage tracing ===
+# ``span(name)`` (context manager) and ``@traced(name)`` (decorator) mark the logical
+# stages of the pipelines: sheet reads, parsing, genus/Gram lookups, aggregation,
+# statistics, figure builds. When tracing is on (microbio --trace FILE, or
+# MICROBIO_TRACE=FILE for notebooks and scripts) each stage records wall time,
+# row counts in/out, peak-RSS growth and, with --trace-memory / MICROBIO_TRACE_MEMORY,
+# the tracemalloc peak; the timeline is written as Chrome trace JSON (chrome://tracing,
+# Perfetto). When off, a span is one attribute check, so the hooks stay in place.
+# Spans in figure-export worker processes are not collected (see manifest.json).
+
+
+def _rows(value):
+    shape = getattr(value, 'shape', None)
+    return int(shape[0]) if shape else None
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10  # bytes on macOS, KiB elsewhere
+
+
+class _NullSpan:
+    rows_in = rows_out = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.rows_in = None
+        self.rows_out = None
+        self._child_peak = 0
+
+    def __enter__(self):
+        tracer = self.tracer
+        self._rss = _peak_rss_mb()
+        if tracer.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if tracer.stack:
+                parent = tracer.stack[-1]
+                parent._child_peak = max(parent._child_peak, peak)
+            tracemalloc.reset_peak()
+            self._traced = current
+        tracer.stack.append(self)
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        tracer = self.tracer
+        tracer.stack.pop()
+        args = dict(self.args)
+        if self.rows_in is not None:
+            args['rows_in'] = self.rows_in
+        if self.rows_out is not None:
+            args['rows_out'] = self.rows_out
+        rss = _peak_rss_mb()
+        if rss is not None:
+            args['peak_rss_mb'] = round(rss, 1)
+            args['peak_rss_growth_mb'] = round(rss - self._rss, 1)
+        if tracer.memory:
+            peak = max(tracemalloc.get_traced_memory()[1], self._child_peak)
+            args['alloc_peak_mb'] = round((peak - self._traced) / 2**20, 3)
+            if tracer.stack:
+                parent = tracer.stack[-1]
+                parent._child_peak = max(parent._child_peak, peak)
+        if exc_type is not None:
+            args['error'] = exc_type.__name__
+        tracer.record(self.name, self.category, self._start, end, args)
+        return False
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.path = None
+        self.events = []
+        self.stack = []
+        self._origin = time.perf_counter_ns()
+        self._pid = None
+        self._written = 0
+
+    def enable(self, path, memory=False):
+        self.enabled = True
+        self.path = path
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self._pid is None:
+            atexit.register(self.write)
+        self._pid = os.getpid()
+
+    def span(self, name, category='stage', **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, category, args)
+
+    def record(self, name, category, start_ns, end_ns, args):
+        self.events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start_ns - self._origin) / 1000,
+            'dur': (end_ns - start_ns) / 1000,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+
+    def write(self, path=None):
+        """Write the Chrome trace JSON; returns its path (None if nothing new to write)."""
+        path = path or self.path
+        if not path or os.getpid() != self._pid or len(self.events) == self._written:
+            return None  # forked workers inherit the tracer but must not overwrite the file
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, fh, ensure_ascii=False)
+        self._written = len(self.events)
+        return path
+
+    def summary(self, top=10):
+        """Total wall time per span name, slowest first, as printable lines."""
+        totals = {}
+        for event in self.events:
+            seconds, calls = totals.get(event['name'], (0.0, 0))
+            totals[event['name']] = (seconds + event['dur'] / 1e6, calls + 1)
+        ranked = sorted(totals.items(), key=lambda item: -item[1][0])[:top]
+        return [f"   {name:<40} {seconds:9.4f} s  ×{calls}" for name, (seconds, calls) in ranked]
+
+
+_tracer = Tracer()
+
+
+def enable(path, memory=False):
+    _tracer.enable(path, memory)
+
+
+def is_enabled():
+    return _tracer.enabled
+
+
+def span(name, category='stage', **args):
+    """Context manager timing one stage; set ``.rows_in`` / ``.rows_out`` on the returned span."""
+    return _tracer.span(name, category, **args)
+
+
+def traced(name, category='stage'):
+    """Decorator form of ``span``; rows come from the first frame/array argument and the result."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return func(*args, **kwargs)
+            with _tracer.span(name, category) as s:
+                s.rows_in = next((rows for rows in map(_rows, args) if rows is not None), None)
+                result = func(*args, **kwargs)
+                s.rows_out = _rows(result)
+                return result
+        return wrapper
+    return decorate
+
+
+def finish():
+    """Write the trace (if enabled) and print where it went and the slowest stages."""
+    if not _tracer.enabled:
+        return None
+    path = _tracer.write()
+    if path:
+        print(f"⏱️ Trace with {len(_tracer.events)} span(s) written to {path}")
+        print("\n".join(_tracer.summary()))
+    return path
+
+
+if os.environ.get('MICROBIO_TRACE'):
+    enable(os.environ['MICROBIO_TRACE'], memory=bool(os.environ.get('MICROBIO_TRACE_MEMORY')))
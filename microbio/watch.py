@@ -0,0 +1,218 @@
+import os
+import threading
+import time
+import traceback
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from microbio.analyses import ANALYSES, load_analysis
+from microbio.dashboard import DASHBOARD_FILE
+from microbio.render import Renderer
+from microbio.tracing import span
+
+# === Watch mode ===
+# `microbio watch [command ...]` runs the analyses once, then polls the workbooks they
+# read (size + mtime, every --interval seconds). A workbook counts as changed once its
+# stat has been stable for --debounce seconds, so Excel's save sequence (temp file,
+# rename, lock file) triggers one refresh. Sheets are kept in memory per
+# (workbook, sheet); on a change only that workbook's sheets are re-read and only the
+# analyses whose INPUTS use a sheet whose content actually changed are rerun: an edit
+# of G-.xlsx reruns medium-distribution and sunburst, an edit of the G(-) sheet alone
+# reruns only method-averages. Figures go to one dashboard directory (--batch, or a temporary
+# one) served on http://127.0.0.1:PORT/; the open page reloads itself after a refresh.
+# A workbook that is missing or unreadable at startup is reported and read once it is
+# saved; the analyses needing it wait until then. One export process pool serves every
+# refresh.
+DEFAULT_PORT = 8050
+DEFAULT_INTERVAL = 1.0  # seconds between polls
+DEFAULT_DEBOUNCE = 1.5  # seconds a workbook must stay unchanged before it is re-read
+VERSION_PATH = '/version'
+
+
+def dependencies(commands):
+    """{workbook: [commands reading one of its sheets]} for the given analyses."""
+    depends = {}
+    for command in commands:
+        for workbook, _ in load_analysis(command).INPUTS.values():
+            depends.setdefault(workbook, [])
+            if command not in depends[workbook]:
+                depends[workbook].append(command)
+    return depends
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class Watcher:
+    """Sheets in memory plus the bookkeeping to rerun only what a file change affects."""
+
+    def __init__(self, data_dir, commands, output_dir, workers=None):
+        self.data_dir = data_dir
+        self.commands = list(commands)
+        self.output_dir = output_dir
+        self.workers = workers
+        self.inputs = {command: load_analysis(command).INPUTS for command in self.commands}
+        self.frames = {}      # (workbook, sheet) -> raw frame
+        self.signatures = {}  # workbook -> (size, mtime_ns) last read
+        self.version = 0      # bumped after every refresh; polled by the open dashboard
+        self.renderer = Renderer(output_dir, ('dashboard',), workers, keep_pool=True)
+
+    def workbooks(self):
+        return list(dependencies(self.commands))
+
+    def read(self, workbook):
+        """Re-read every watched sheet of ``workbook``; returns the (workbook, sheet) keys whose content changed."""
+        from microbio.workbooks import load_inputs
+
+        signature = _stat(os.path.join(self.data_dir, workbook))
+        sheets = {(wb, sheet) for inputs in self.inputs.values() for wb, sheet in inputs.values() if wb == workbook}
+        fresh = load_inputs({key: key for key in sheets}, self.data_dir)
+        changed = [key for key, df in fresh.items() if key not in self.frames or not df.equals(self.frames[key])]
+        self.frames.update(fresh)
+        self.signatures[workbook] = signature
+        return changed
+
+    def affected(self, changed):
+        return [command for command in self.commands
+                if any(key in changed for key in self.inputs[command].values())]
+
+    def run(self, commands):
+        for command in commands:
+            print(f"\n▶️ {command}")
+            missing = sorted({wb for wb, sheet in self.inputs[command].values() if (wb, sheet) not in self.frames})
+            if missing:
+                print(f"⏸️ {command} waits for {', '.join(missing)}")
+                continue
+            started = time.perf_counter()
+            renderer = self.renderer
+            renderer.begin(command)
+            frames = {key: self.frames[source] for key, source in self.inputs[command].items()}
+            try:
+                with span(command, 'command'):
+                    load_analysis(command).run(self.data_dir, renderer, frames)
+                    renderer.finish()
+            except Exception:
+                traceback.print_exc()
+                print(f"⚠️ {command} failed; fix the workbook and save again")
+                continue
+            print(f"⏱️ {command} refreshed in {time.perf_counter() - started:.1f} s")
+        self.version += 1
+
+    def start(self):
+        for workbook in self.workbooks():
+            self.read_or_report(workbook)
+        self.run(self.commands)
+
+    def read_or_report(self, workbook):
+        """``read`` that reports a missing, half-written or locked file and retries on its next save."""
+        try:
+            return self.read(workbook)
+        except Exception as exc:
+            self.signatures[workbook] = _stat(os.path.join(self.data_dir, workbook))
+            print(f"⚠️ Could not read {workbook}: {type(exc).__name__}: {exc}")
+            return []
+
+    def close(self):
+        self.renderer.close()
+
+    def poll(self, pending, debounce):
+        """Check the workbooks once; ``pending`` maps workbook -> (signature, first seen).
+
+        Returns the workbooks that changed and have been stable for ``debounce`` seconds.
+        """
+        now = time.monotonic()
+        ready = []
+        for workbook in self.workbooks():
+            signature = _stat(os.path.join(self.data_dir, workbook))
+            if signature is None or signature == self.signatures.get(workbook):
+                pending.pop(workbook, None)
+                continue
+            seen = pending.get(workbook)
+            if seen is None or seen[0] != signature:
+                pending[workbook] = (signature, now)  # still being written: restart the wait
+            elif now - seen[1] >= debounce:
+                ready.append(workbook)
+                del pending[workbook]
+        return ready
+
+    def refresh(self, workbooks):
+        started = time.perf_counter()
+        changed = []
+        for workbook in workbooks:
+            changed += self.read_or_report(workbook)
+        commands = self.affected(changed)
+        if not commands:
+            print(f"🔁 {', '.join(workbooks)} saved without changes to the watched sheets")
+            return
+        print(f"🔁 {', '.join(f'{wb} / {sheet}' for wb, sheet in changed)} changed → {', '.join(commands)}")
+        self.run(commands)
+        print(f"✅ Refreshed in {time.perf_counter() - started:.1f} s")
+
+
+def _handler(watcher):
+    class Handler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=watcher.output_dir, **kwargs)
+
+        def do_GET(self):
+            if self.path.split('?')[0] == VERSION_PATH:
+                body = str(watcher.version).encode('ascii')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            if self.path in ('', '/'):
+                self.path = '/' + DASHBOARD_FILE
+            super().do_GET()
+
+        def end_headers(self):
+            self.send_header('Cache-Control', 'no-store')  # refreshed figures keep their file names
+            super().end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(watcher, port=DEFAULT_PORT):
+    """Serve the dashboard directory on 127.0.0.1 from a daemon thread; returns the server."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), _handler(watcher))
+    threading.Thread(target=server.serve_forever, name='microbio-watch-http', daemon=True).start()
+    return server
+
+
+def watch(data_dir, commands=None, output_dir=None, port=DEFAULT_PORT, interval=DEFAULT_INTERVAL,
+          debounce=DEFAULT_DEBOUNCE, workers=None):
+    """Run ``commands`` (default: all analyses) and rerun them on workbook changes until Ctrl+C."""
+    if output_dir is None:
+        import tempfile
+
+        output_dir = tempfile.mkdtemp(prefix='microbio-watch-')
+    os.makedirs(output_dir, exist_ok=True)
+    watcher = Watcher(data_dir, commands or list(ANALYSES), output_dir, workers)
+    watcher.start()
+    server = serve(watcher, port)
+    print(f"\n👀 Watching {', '.join(watcher.workbooks())} in {data_dir}")
+    print(f"📊 Dashboard: http://127.0.0.1:{server.server_address[1]}/ (Ctrl+C to stop)")
+
+    pending = {}
+    try:
+        while True:
+            time.sleep(interval)
+            ready = watcher.poll(pending, debounce)
+            if ready:
+                with span('watch.refresh', 'command', workbooks=len(ready)):
+                    watcher.refresh(ready)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        server.shutdown()
+        watcher.close()
+    return 0
@@ -0,0 +1,278 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from microbio.compact import compact_enabled, compact_frame, memory_report
+from microbio.tracing import span
+
+# === Columnar cache for the lab workbooks ===
+# Each (workbook, sheet) is parsed with openpyxl once and stored as an Arrow IPC file in
+# .microbio_cache/ next to the workbook. Later reads memory-map that file instead.
+# The cache entry remembers the workbook's size, mtime and SHA-256, so any edit to the
+# workbook invalidates it; a touched-but-unchanged file only costs one hash.
+#
+# Analyses ask only for the columns of their sheet schema (datasets.SHEET_SCHEMAS).
+# The header row is probed first, so a missing or renamed column fails at once with a
+# SchemaError naming the closest header; then the rows are streamed in openpyxl
+# read-only mode keeping only the projected cells, and the frame is built in chunks of
+# STREAM_CHUNK_ROWS. Such cache entries hold just those columns (a later request for
+# more columns re-reads the union), and cached reads map only the requested columns.
+CACHE_DIR_NAME = '.microbio_cache'
+CACHE_VERSION = 2
+STREAM_CHUNK_ROWS = 10_000
+
+
+class SchemaError(ValueError):
+    """A sheet lacks columns an analysis reads; raised from the header row, before any data is read."""
+
+
+def cache_dir_for(path):
+    return os.environ.get('MICROBIO_CACHE_DIR') or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_paths(path, sheet_name):
+    key = hashlib.sha1(f"{os.path.abspath(path)}\0{sheet_name}".encode('utf-8')).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    base = os.path.join(cache_dir_for(path), f"{stem}-{key}")
+    return base + '.arrow', base + '.json'
+
+
+def _to_arrow(df):
+    """Arrow needs one type per column; mixed object columns (numbers and text typed into
+    the same Excel column) are stored as text, which every analysis parses anyway."""
+    import pyarrow as pa
+
+    df = df.copy()
+    df.columns = [str(c) for c in df.columns]
+    for col in df.columns:
+        if df[col].dtype == object:
+            try:
+                pa.array(df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v)).astype(object)
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _read_cached(arrow_path, columns=None):
+    import pyarrow as pa
+
+    with pa.memory_map(arrow_path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select([str(c) for c in columns])
+        return table.to_pandas()
+
+
+def _write_cached(df, arrow_path, meta_path, meta):
+    import pyarrow as pa
+
+    os.makedirs(os.path.dirname(arrow_path), exist_ok=True)
+    table = _to_arrow(df)
+    tmp = arrow_path + f".{os.getpid()}.tmp"
+    with pa.OSFile(tmp, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, arrow_path)
+    _write_meta(meta_path, meta)
+
+
+def _write_meta(meta_path, meta):
+    tmp = meta_path + f".{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(meta, fh, ensure_ascii=False, indent=1)
+    os.replace(tmp, meta_path)
+
+
+def _header_names(row):
+    """Column names as ``pd.read_excel`` makes them: 'Unnamed: i' for blanks, '.1' suffixes for repeats."""
+    names, seen = [], {}
+    for i, value in enumerate(row):
+        name = f"Unnamed: {i}" if value is None else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _open_sheet(path, sheet_name):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    if sheet_name not in workbook.sheetnames:
+        workbook.close()
+        raise ValueError(f"Worksheet named '{sheet_name}' not found in {os.path.basename(path)}")
+    return workbook, workbook[sheet_name]
+
+
+def read_header(path, sheet_name):
+    """Column names of a sheet from its first row only."""
+    workbook, sheet = _open_sheet(path, sheet_name)
+    try:
+        return _header_names(next(sheet.iter_rows(max_row=1, values_only=True), ()))
+    finally:
+        workbook.close()
+
+
+def project_columns(header, columns, where=''):
+    """Header names for ``columns`` (matched after stripping whitespace), in sheet order.
+
+    Raises SchemaError listing every missing column and the closest header names.
+    """
+    import difflib
+
+    stripped = {str(name).strip(): name for name in header}
+    missing = [col for col in columns if col not in stripped]
+    if missing:
+        hints = []
+        for col in missing:
+            close = difflib.get_close_matches(col, list(stripped), n=1, cutoff=0.6)
+            hints.append(f"{col!r}" + (f" (found {stripped[close[0]]!r})" if close else ""))
+        raise SchemaError(f"{where or 'Sheet'} lacks column(s) " + ', '.join(hints))
+    wanted = {stripped[col] for col in columns}
+    return [name for name in header if name in wanted]
+
+
+def _chunk_frame(names, buffers):
+    chunk = pd.DataFrame(dict(zip(names, buffers)))
+    for name in names:
+        if chunk[name].dtype == object:
+            chunk[name] = chunk[name].where(chunk[name].notna(), np.nan)  # None -> NaN as in read_excel
+    return chunk
+
+
+def stream_columns(path, sheet_name, columns, chunk_rows=STREAM_CHUNK_ROWS):
+    """Only ``columns`` of a sheet, streamed row by row; the header is checked before any data row."""
+    return _stream(path, sheet_name, columns, chunk_rows)[1]
+
+
+def _stream(path, sheet_name, columns, chunk_rows=STREAM_CHUNK_ROWS):
+    workbook, sheet = _open_sheet(path, sheet_name)
+    try:
+        rows = sheet.iter_rows(values_only=True)
+        header = _header_names(next(rows, ()))
+        names = project_columns(header, columns, f"{os.path.basename(path)} / {sheet_name}")
+        positions = [header.index(name) for name in names]
+        chunks, buffers, filled = [], [[] for _ in names], 0
+        last_filled = -1  # trailing rows empty in every column are dropped, as read_excel does
+        for i, row in enumerate(rows):
+            values = [row[p] if p < len(row) else None for p in positions]
+            if any(v is not None and v != '' for v in row):
+                last_filled = i
+            for buffer, value in zip(buffers, values):
+                buffer.append(value)
+            filled += 1
+            if filled == chunk_rows:
+                chunks.append(_chunk_frame(names, buffers))
+                buffers, filled = [[] for _ in names], 0
+        chunks.append(_chunk_frame(names, buffers))
+    finally:
+        workbook.close()
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    return header, df.iloc[:last_filled + 1]
+
+
+def read_sheet(path, sheet_name, columns=None):
+    """Drop-in for ``pd.read_excel(path, sheet_name=...)`` backed by the columnar cache.
+
+    With ``columns`` only those are returned (header names matched after stripping
+    whitespace, original names kept), and a SchemaError is raised before reading any
+    data when one is missing. Falls back to uncached reads when pyarrow is not
+    installed or when MICROBIO_NO_CACHE is set.
+    """
+    columns = None if columns is None else list(columns)
+    try:
+        import pyarrow  # noqa: F401
+        cached = not os.environ.get('MICROBIO_NO_CACHE')
+    except ImportError:
+        cached = False
+    if not cached:
+        return pd.read_excel(path, sheet_name=sheet_name) if columns is None else stream_columns(path, sheet_name, columns)
+
+    arrow_path, meta_path = _cache_paths(path, sheet_name)
+    stat = os.stat(path)
+    meta = None
+    if os.path.exists(arrow_path) and os.path.exists(meta_path):
+        try:
+            with open(meta_path, encoding='utf-8') as fh:
+                meta = json.load(fh)
+        except (OSError, ValueError):
+            meta = None
+
+    fresh = False
+    if meta and meta.get('version') == CACHE_VERSION:
+        if meta['size'] == stat.st_size and meta['mtime_ns'] == stat.st_mtime_ns:
+            fresh = True
+        elif meta['size'] == stat.st_size and meta['sha256'] == _file_sha256(path):
+            # Saved again without changes (or copied): refresh the mtime and reuse
+            meta['mtime_ns'] = stat.st_mtime_ns
+            _write_meta(meta_path, meta)
+            fresh = True
+
+    where = f"{os.path.basename(path)} / {sheet_name}"
+    stored = meta.get('columns') if fresh else None  # None: the whole sheet
+    requested = columns
+    if fresh and columns is None and stored is None:
+        return _read_cached(arrow_path)
+    if fresh and columns is not None:
+        names = project_columns(meta['header'], columns, where)
+        if stored is None or all(name in stored for name in names):
+            return _read_cached(arrow_path, names)
+        # Cached with other columns: read the union so alternating requests settle
+        columns = list(dict.fromkeys(columns + [name.strip() for name in stored]))
+
+    if columns is None:
+        df = pd.read_excel(path, sheet_name=sheet_name)
+        header = list(df.columns)
+    else:
+        header, df = _stream(path, sheet_name, columns)
+    meta = {
+        'version': CACHE_VERSION,
+        'source': os.path.abspath(path),
+        'sheet_name': sheet_name,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': _file_sha256(path),
+        'header': [str(name) for name in header],
+        'columns': None if columns is None else [str(name) for name in df.columns],
+    }
+    try:
+        _write_cached(df, arrow_path, meta_path, meta)
+    except OSError as exc:
+        print(f"⚠️ Could not write workbook cache for {os.path.basename(path)}: {exc}")
+    if requested is not None and columns is not requested:
+        return df[project_columns(list(df.columns), requested, where)]
+    return df
+
+
+def load_inputs(inputs, data_dir):
+    """Read every (workbook, sheet) of an analysis' INPUTS mapping from ``data_dir``.
+
+    Sheets with a schema in datasets.SHEET_SCHEMAS are read as just those columns.
+    """
+    from microbio.datasets import SHEET_SCHEMAS
+
+    frames = {}
+    for key, (workbook, sheet) in inputs.items():
+        schema = SHEET_SCHEMAS.get((workbook, sheet))
+        with span(f'read {workbook} / {sheet}', 'load') as s:
+            frames[key] = read_sheet(os.path.join(data_dir, workbook), sheet, schema)
+            s.rows_out = len(frames[key])
+        if compact_enabled():
+            with span(f'compact {workbook} / {sheet}', 'load'):
+                raw = frames[key]
+                frames[key] = compact_frame(raw, SHEET_SCHEMAS.get((workbook, sheet)))
+            memory_report(f"{workbook} / {sheet}", raw, frames[key])
+    return frames
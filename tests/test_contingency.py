@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import chi2_contingency
+
+from microbio.contingency import ContingencyTable, independence_tests
+
+
+def _counts(tables):
+    """Grouped counts from {cycle: dense table} (rows: medium, columns: genus)."""
+    rows = [(cycle, f"m{i}", f"g{j}", n)
+            for cycle, table in tables.items() for (i, j), n in np.ndenumerate(table) if n]
+    return pd.DataFrame(rows, columns=['cycle', 'medium', 'genus', 'count'])
+
+
+def test_chi_square_and_g_match_scipy():
+    rng = np.random.default_rng(0)
+    tables = {'I': rng.integers(1, 30, (3, 4)), 'II': rng.integers(1, 30, (4, 5)), 'III': rng.integers(1, 30, (2, 2))}
+    tests = independence_tests(_counts(tables), 'medium', 'genus').set_index('cycle')
+    for cycle, table in tables.items():
+        chi2, p, dof, expected = chi2_contingency(table, correction=False)
+        g, p_g, _, _ = chi2_contingency(table, correction=False, lambda_='log-likelihood')
+        row = tests.loc[cycle]
+        assert row['n'] == table.sum()
+        assert row['dof'] == dof
+        assert row['chi2'] == pytest.approx(chi2)
+        assert row['p_chi2'] == pytest.approx(p)
+        assert row['G'] == pytest.approx(g)
+        assert row['p_G'] == pytest.approx(p_g)
+        assert row['min_expected'] == pytest.approx(expected.min())
+
+
+def test_empty_rows_and_columns_do_not_count():
+    # m1 and g1 are only observed in cycle II, so cycle I is a 2 × 2 table
+    tables = {'I': np.array([[4, 0, 7], [0, 0, 0], [6, 0, 2]]), 'II': np.array([[1, 2, 3], [4, 5, 6], [7, 8, 9]])}
+    tests = independence_tests(_counts(tables), 'medium', 'genus').set_index('cycle')
+    chi2, _, dof, _ = chi2_contingency(np.array([[4, 7], [6, 2]]), correction=False)
+    assert tests.loc['I', 'dof'] == dof == 1
+    assert tests.loc['I', 'chi2'] == pytest.approx(chi2)
+
+
+def test_untestable_strata_are_nan():
+    tests = independence_tests(_counts({'I': np.array([[3, 5]])}), 'medium', 'genus')
+    assert tests.loc[0, 'dof'] == 0
+    assert np.isnan(tests.loc[0, 'chi2']) and np.isnan(tests.loc[0, 'p_G'])
+
+
+def test_strata_in_cycle_order():
+    cycles = ['IX', 'I', 'X', 'II', 'V', 'IV', 'III', 'VI', 'VII', 'VIII']
+    size = {cycle: k + 1 for k, cycle in enumerate(cycles)}  # a different isolate count per cycle
+    df = pd.DataFrame({'cycle': [cycle for cycle in cycles for _ in range(size[cycle])]})
+    df['medium'], df['genus'] = 'a', 'x'
+    table = ContingencyTable.from_frame(df, 'medium', 'genus', 'cycle')
+    assert list(table.strata) == ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X']
+    for cycle in cycles:
+        assert table.dense(cycle).to_numpy().sum() == size[cycle]
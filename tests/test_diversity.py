@@ -0,0 +1,71 @@
+import math
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from microbio.diversity import AbundanceMatrix
+
+
+def _matrix(cells):
+    """AbundanceMatrix from {cell: {taxon: count}}."""
+    rows = [(cell, taxon, n) for cell, counts in cells.items() for taxon, n in counts.items()]
+    df = pd.DataFrame(rows, columns=['cell', 'genus', 'count'])
+    return AbundanceMatrix.from_frame(df, ['cell'], 'genus', 'count')
+
+
+def test_chao1_bias_corrected():
+    # N = 10, S = 5, F1 = 3, F2 = 1: 5 + (9/10) · 3 · 2 / (2 · 2) = 6.35
+    alpha = _matrix({'a': {'A': 1, 'B': 1, 'C': 1, 'D': 2, 'E': 5}}).alpha()
+    assert alpha.loc[0, 'N'] == 10
+    assert alpha.loc[0, 'S'] == 5
+    assert alpha.loc[0, 'chao1'] == pytest.approx(6.35)
+
+
+def test_chao1_without_singletons_is_observed():
+    alpha = _matrix({'a': {'A': 2, 'B': 3}}).alpha()
+    assert alpha.loc[0, 'chao1'] == 2
+
+
+def test_single_taxon_shannon_is_positive_zero():
+    alpha = _matrix({'a': {'A': 4}}).alpha()
+    assert alpha.loc[0, 'shannon'] == 0
+    assert not np.signbit(alpha.loc[0, 'shannon'])
+
+
+def test_shannon_and_simpson():
+    alpha = _matrix({'a': {'A': 1, 'B': 3}}).alpha()
+    p = np.array([0.25, 0.75])
+    assert alpha.loc[0, 'shannon'] == pytest.approx(-(p * np.log(p)).sum())
+    assert alpha.loc[0, 'simpson'] == pytest.approx(1 - (p * p).sum())
+
+
+def test_rarefaction_matches_exact_binomials():
+    cells = {'a': {'A': 5, 'B': 2, 'C': 1, 'D': 1}, 'b': {'A': 3, 'E': 3}, 'c': {'B': 1}}
+    matrix = _matrix(cells)
+    depths = np.arange(1, 10)
+    curves = matrix.rarefaction(depths)
+    for i, counts in enumerate(cells.values()):
+        total = sum(counts.values())
+        for n in depths:
+            if n > total:
+                assert np.isnan(curves.iloc[i][n])
+                continue
+            expected = sum(1 - math.comb(total - k, n) / math.comb(total, n) for k in counts.values())
+            assert curves.iloc[i][n] == pytest.approx(expected)
+
+
+def test_rarefaction_matches_subset_enumeration():
+    counts = {'A': 3, 'B': 2, 'C': 1}
+    individuals = [taxon for taxon, k in counts.items() for _ in range(k)]
+    curves = _matrix({'a': counts}).rarefaction(np.arange(1, 7))
+    for n in range(1, 7):
+        draws = [len(set(draw)) for draw in combinations(individuals, n)]
+        assert curves.iloc[0][n] == pytest.approx(sum(draws) / len(draws))
+
+
+def test_rarefaction_in_chunks_matches_one_pass():
+    matrix = _matrix({'a': {'A': 40, 'B': 7, 'C': 1}, 'b': {'A': 2, 'D': 9}})
+    depths = np.arange(1, 49)
+    pd.testing.assert_frame_equal(matrix.rarefaction(depths, max_chunk_bytes=1), matrix.rarefaction(depths))
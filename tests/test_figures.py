@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from microbio.figures import _box_sample, box_summary, summary_box
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_box_sample_draws_without_repeats(seed):
+    rng = np.random.default_rng(seed)
+    values = np.concatenate([rng.normal(size=rng.integers(10, 400)), rng.normal(20, 5, rng.integers(0, 60))])
+    outliers = box_summary(values)['outliers']
+    cap = int(rng.integers(3, 80))
+    sample = _box_sample(values, outliers, cap, rng)
+
+    positions = [np.flatnonzero(values == v) for v in sample]
+    assert len(sample) == min(cap, len(values))
+    assert len({p for found in positions for p in found}) >= len(sample)  # no position used twice
+    assert len(np.unique(sample)) == len(sample)  # continuous values: distinct positions are distinct values
+    assert values.min() in sample and values.max() in sample
+
+
+def test_box_sample_keeps_small_groups_whole():
+    values = np.array([1.0, 1.0, 2.0])
+    np.testing.assert_array_equal(_box_sample(values, np.array([]), 5, np.random.default_rng(0)), values)
+
+
+def test_summary_box_skips_groups_without_values():
+    df = pd.DataFrame({'group': ['a'] * 4 + ['b'] * 2 + ['c'] * 3,
+                       'value': [1, 2, 3, 4, np.nan, np.nan, 5, 6, 7]})
+    fig = summary_box(df, 'value', 'group', 'title', {}, '')
+    assert list(fig.layout.xaxis.ticktext) == ['a', 'c']
+    assert [trace.x[0] for trace in fig.data if trace.type == 'box'] == [0, 1]
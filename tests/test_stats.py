@@ -0,0 +1,38 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import mannwhitneyu, ttest_ind
+
+from microbio.locations import CONTROL_GROUP, OTHER_GROUP
+from microbio.stats import MAX_SHAPIRO_N, benjamini_hochberg, compare_groups, holm
+
+
+def _frame(a, b):
+    return pd.DataFrame({'group': [CONTROL_GROUP] * len(a) + [OTHER_GROUP] * len(b), 'x': np.r_[a, b]})
+
+
+def test_normal_groups_use_welch_t_test():
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(0, 1, 40), rng.normal(1, 2, 30)
+    row = compare_groups(_frame(a, b), ['x']).iloc[0]
+    assert row['test'] == 't-test'
+    assert row['p_value'] == pytest.approx(ttest_ind(a, b, equal_var=False, alternative='less').pvalue)
+
+
+def test_large_groups_skip_shapiro_without_warnings():
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(size=MAX_SHAPIRO_N + 1), rng.normal(size=20)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        row = compare_groups(_frame(a, b), ['x']).iloc[0]
+    assert np.isnan(row['shapiro_p_a']) and not np.isnan(row['shapiro_p_b'])
+    assert row['test'] == 'Mann–Whitney U'
+    assert row['p_value'] == pytest.approx(mannwhitneyu(a, b, alternative='less').pvalue)
+
+
+def test_p_value_adjustments():
+    p = [0.01, 0.04, np.nan, 0.03]
+    np.testing.assert_allclose(holm(p), [0.03, 0.06, np.nan, 0.06])
+    np.testing.assert_allclose(benjamini_hochberg(p), [0.03, 0.04, np.nan, 0.04])
@@ -0,0 +1,25 @@
+import pytest
+
+from microbio.store import cycle_sort_key, roman_value
+
+ROMAN_CYCLES = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X']
+
+
+@pytest.mark.parametrize('value, text', list(enumerate(ROMAN_CYCLES, start=1)))
+def test_roman_value(value, text):
+    assert roman_value(text) == value
+
+
+@pytest.mark.parametrize('text', ['', 'IIII', 'VX', 'iv', 'cycle 1', None])
+def test_roman_value_rejects_other_text(text):
+    assert roman_value(text) is None
+
+
+def test_cycle_sort_key_orders_roman_numerals_numerically():
+    shuffled = ['IX', 'III', 'X', 'I', 'VIII', 'IV', 'II', 'VII', 'V', 'VI']
+    assert sorted(shuffled, key=cycle_sort_key) == ROMAN_CYCLES
+
+
+def test_cycle_sort_key_numbers_before_other_text():
+    cycles = ['pilot', 'II', '10', 3, 'I', 'extra']
+    assert sorted(cycles, key=cycle_sort_key) == ['I', 'II', 3, '10', 'extra', 'pilot']
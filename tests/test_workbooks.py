@@ -0,0 +1,29 @@
+import openpyxl
+import pandas as pd
+
+from microbio.workbooks import stream_columns
+
+
+def _workbook(path, rows):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = 'Sheet'
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+def test_stream_keeps_rows_filled_outside_the_projection(tmp_path):
+    path = _workbook(tmp_path / 'book.xlsx', [['a', 'b', 'c'], [1, 2, 3], [None, None, 4], [None, None, None],
+                                              [None, None, 'x'], [None, None, None]])
+    expected = pd.read_excel(path, sheet_name='Sheet')[['a', 'b']]
+    streamed = stream_columns(path, 'Sheet', ['a', 'b'])
+    assert len(streamed) == len(expected) == 4
+    pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+
+
+def test_stream_in_chunks_matches_one_pass(tmp_path):
+    path = _workbook(tmp_path / 'book.xlsx', [['a', 'b']] + [[i, f"r{i}"] for i in range(25)])
+    pd.testing.assert_frame_equal(stream_columns(path, 'Sheet', ['b', 'a'], chunk_rows=4),
+                                  stream_columns(path, 'Sheet', ['b', 'a']))